@@ -7,23 +7,58 @@ and extract useful information for building knowledge graphs.
 """
 
 import os
+import re
 import sys
 import gzip
+import mmap
 import logging
+import multiprocessing
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, Tuple, List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Tuple, List, Dict, Any, Optional
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     import rdflib
-    from rdflib import Graph, URIRef, Literal, Namespace
-    from rdflib.namespace import RDF, RDFS, OWL
+    from rdflib import Graph, URIRef, BNode, Literal, Namespace
+    from rdflib.namespace import RDF, RDFS, OWL, XSD
+    from rdflib.parser import InputSource
+    from rdflib.plugins.sparql import prepareQuery
 except ImportError:
     print("Error: rdflib not installed. Install with: pip install rdflib")
     sys.exit(1)
 
+try:
+    import pyoxigraph
+except ImportError:
+    pyoxigraph = None
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+try:
+    import oxrdflib
+except ImportError:
+    oxrdflib = None
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    import pgzip
+except ImportError:
+    pgzip = None
+
 try:
     import networkx as nx
     import matplotlib.pyplot as plt
@@ -40,20 +75,160 @@ PUBCHEM_SUBSTANCE = Namespace("http://rdf.ncbi.nlm.nih.gov/pubchem/substance/")
 OBO = Namespace("http://purl.obolibrary.org/obo/")
 CHEMINF = Namespace("http://semanticscience.org/resource/")
 
+# Number of triples buffered before flushing into the graph with addN
+ADD_BATCH_SIZE = 10000
+
+# File name suffixes recognised as RDF data
+RDF_FILE_SUFFIXES = ('.ttl', '.ttl.gz', '.rdf', '.rdf.gz')
+
+# One N-Triples statement with IRI subject and predicate per line
+NTRIPLE_LINE_RE = re.compile(rb'^<([^>]+)>\s+<([^>]+)>\s+(.+?)\s*\.\s*$')
+LITERAL_VALUE_RE = re.compile(rb'^"((?:[^"\\]|\\.)*)"')
+
+# Log a progress line every N files when parsing many files
+PROGRESS_LOG_INTERVAL = 100
+
+# rdflib format names mapped to pyoxigraph RdfFormat attribute names
+OXIGRAPH_FORMATS = {
+    'turtle': 'TURTLE',
+    'ttl': 'TURTLE',
+    'nt': 'N_TRIPLES',
+    'ntriples': 'N_TRIPLES',
+    'nt11': 'N_TRIPLES',
+    'nquads': 'N_QUADS',
+    'trig': 'TRIG',
+    'n3': 'N3',
+    'xml': 'RDF_XML',
+    'application/rdf+xml': 'RDF_XML',
+}
+
+
+# str() of frequently repeated terms (predicates), keyed on the term itself
+_STR_CACHE: Dict[Any, str] = {}
+
+
+def _s(term, _cache=_STR_CACHE) -> str:
+    """Return str(term), reusing the cached string for terms seen before."""
+    try:
+        return _cache[term]
+    except KeyError:
+        value = _cache[term] = str(term)
+        return value
+
+
+def _from_oxigraph(term):
+    """Convert a pyoxigraph term into the equivalent rdflib term."""
+    if isinstance(term, pyoxigraph.NamedNode):
+        return URIRef(term.value)
+    if isinstance(term, pyoxigraph.BlankNode):
+        return BNode(term.value)
+    if term.language:
+        return Literal(term.value, lang=term.language)
+    if term.datatype.value == str(XSD.string):
+        return Literal(term.value)
+    return Literal(term.value, datatype=URIRef(term.datatype.value))
+
+
+class _UniqueCounter:
+    """
+    Count distinct terms, using a scalable Bloom filter when pybloom_live is
+    installed so memory stays bounded (counts are then approximate).
+    """
+    
+    def __init__(self):
+        if ScalableBloomFilter is not None:
+            self._seen = ScalableBloomFilter(
+                initial_capacity=100000,
+                error_rate=0.001,
+                mode=ScalableBloomFilter.LARGE_SET_GROWTH
+            )
+        else:
+            self._seen = set()
+    
+    def add(self, term):
+        self._seen.add(str(term))
+    
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class _BatchingSink(Graph):
+    """
+    Graph view used as the parser target that buffers triples and flushes
+    them to the shared store with addN instead of one add call per triple.
+    """
+    
+    def __init__(self, graph: Graph, batch_size: int = ADD_BATCH_SIZE):
+        super().__init__(
+            store=graph.store,
+            identifier=graph.identifier,
+            namespace_manager=graph.namespace_manager
+        )
+        self.batch_size = batch_size
+        self._buf = []
+    
+    def add(self, triple):
+        """Buffer a triple, flushing once the batch is full."""
+        self._buf.append((*triple, self))
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+        return self
+    
+    def flush(self):
+        """Insert all buffered triples into the store."""
+        if self._buf:
+            self.addN(self._buf)
+            self._buf = []
+
 
 class PubChemRDFParser:
     """Parser for PubChem RDF data files."""
     
-    def __init__(self, data_directory: str = "data/pubchem_rdf"):
-        """Initialize the parser with the data directory."""
+    def __init__(self, data_directory: str = "data/pubchem_rdf",
+                 parallelization: Optional[int] = None,
+                 store: str = "default"):
+        """
+        Initialize the parser with the data directory.
+        
+        Args:
+            data_directory: Directory containing downloaded RDF files
+            parallelization: Threads used by rapidgzip to decompress .gz files
+                (defaults to CPU count)
+            store: rdflib store plugin for the graph; "Oxigraph" uses the
+                native oxrdflib store when it is installed
+        """
         self.data_directory = Path(data_directory)
+        self.parallelization = parallelization or os.cpu_count() or 1
         self.logger = logging.getLogger(__name__)
         
         # Initialize RDF graph
-        self.graph = Graph()
+        if store == "Oxigraph" and oxrdflib is None:
+            self.logger.warning("oxrdflib not installed, using the default in-memory store")
+            store = "default"
+        self.graph = Graph(store=store)
         
         # Bind common namespaces
         self._bind_namespaces()
+        
+        # Precompiled queries
+        self._q_count = prepareQuery("SELECT (COUNT(?s) AS ?c) WHERE { ?s a ?t }")
+        # LIMIT cannot be bound as a parameter, so it is applied while iterating
+        self._q_compounds = prepareQuery(
+            """
+            SELECT ?compound ?label
+            WHERE {
+                ?compound a pubchem:Compound .
+                OPTIONAL { ?compound rdfs:label ?label }
+            }
+            """,
+            initNs={'pubchem': PUBCHEM, 'rdfs': RDFS}
+        )
+        
+        # Query result caches, keyed on the graph version so that entries
+        # from before the last successful parse are never hit again
+        self._graph_version = 0
+        self._cached_compounds = lru_cache(maxsize=1024)(self._query_compounds)
+        self._cached_props = lru_cache(maxsize=10_000)(self._query_compound_properties)
     
     def _bind_namespaces(self):
         """Bind common namespaces to the graph."""
@@ -85,92 +260,276 @@ class PubChemRDFParser:
             self.logger.warning(f"Directory not found: {search_dir}")
             return []
         
-        # Find .ttl and .ttl.gz files
-        rdf_files = []
-        for pattern in ["*.ttl", "*.ttl.gz", "*.rdf", "*.rdf.gz"]:
-            rdf_files.extend(search_dir.glob(pattern))
-        
-        self.logger.info(f"Found {len(rdf_files)} RDF files in {search_dir}")
+        # Find .ttl, .rdf and their .gz variants in a single directory scan
+        with os.scandir(search_dir) as entries:
+            matches = (
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(RDF_FILE_SUFFIXES) and entry.is_file()
+            )
+            rdf_files = list(islice(matches, limit) if limit else matches)
         
         if limit:
-            rdf_files = rdf_files[:limit]
-            self.logger.info(f"Limited to {len(rdf_files)} files")
+            self.logger.info(f"Found {len(rdf_files)} RDF files in {search_dir} (limit {limit})")
+        else:
+            self.logger.info(f"Found {len(rdf_files)} RDF files in {search_dir}")
         
         return rdf_files
     
-    def parse_file(self, file_path: Path, format: str = "turtle") -> bool:
+    def parse_file(self, file_path: Path, format: str = "turtle",
+                   backend: str = "rdflib") -> bool:
         """
         Parse a single RDF file and add to the graph.
         
         Args:
             file_path: Path to the RDF file
             format: RDF format (turtle, xml, n3, etc.)
+            backend: Parser backend, "rdflib" or "oxigraph" (falls back to
+                rdflib when pyoxigraph is not installed)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            self.logger.info(f"Parsing file: {file_path}")
+            self.logger.debug("Parsing file: %s", file_path)
             
-            # Handle compressed files
-            if file_path.suffix == '.gz':
-                with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                    self.graph.parse(f, format=format)
+            if backend == "oxigraph" and pyoxigraph is not None:
+                self._parse_file_oxigraph(file_path, format)
             else:
-                self.graph.parse(str(file_path), format=format)
+                sink = _BatchingSink(self.graph)
+                # Handle compressed files
+                if file_path.suffix == '.gz':
+                    with self._open_gzip(file_path) as f:
+                        sink.parse(f, format=format)
+                elif file_path.stat().st_size > 0:
+                    self._parse_mmap(sink, file_path, format)
+                else:
+                    sink.parse(str(file_path), format=format)
+                sink.flush()
             
-            self.logger.info(f"Successfully parsed {file_path}")
+            self._graph_version += 1
+            self.logger.debug("Successfully parsed %s", file_path)
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to parse {file_path}: {e}")
             return False
     
-    def parse_multiple_files(self, file_paths: List[Path], format: str = "turtle") -> int:
+    def _open_gzip(self, file_path: Path):
+        """Open a gzip file as a binary stream, decompressing in parallel when rapidgzip is available."""
+        if rapidgzip is not None:
+            return rapidgzip.open(str(file_path), parallelization=self.parallelization)
+        return gzip.open(file_path, 'rb')
+    
+    def _parse_mmap(self, sink: Graph, file_path: Path, format: str):
+        """Parse an uncompressed file through a read-only memory map."""
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            source = InputSource(system_id=file_path.absolute().as_uri())
+            source.setByteStream(mm)
+            sink.parse(source=source, format=format)
+    
+    def _parse_file_oxigraph(self, file_path: Path, format: str):
+        """Parse a file with the native pyoxigraph parser and batch-insert the triples."""
+        rdf_format = getattr(pyoxigraph.RdfFormat, OXIGRAPH_FORMATS.get(format, 'TURTLE'))
+        
+        if file_path.suffix == '.gz':
+            f = self._open_gzip(file_path)
+        else:
+            f = open(file_path, 'rb')
+        
+        with f:
+            batch = []
+            for quad in pyoxigraph.parse(input=f, format=rdf_format):
+                batch.append((
+                    _from_oxigraph(quad.subject),
+                    _from_oxigraph(quad.predicate),
+                    _from_oxigraph(quad.object),
+                    self.graph
+                ))
+                if len(batch) >= ADD_BATCH_SIZE:
+                    self.graph.addN(batch)
+                    batch = []
+            if batch:
+                self.graph.addN(batch)
+    
+    def parse_multiple_files(self, file_paths: List[Path], format: str = "turtle",
+                             backend: str = "rdflib",
+                             max_workers: Optional[int] = None,
+                             optimize_workers: bool = False) -> int:
         """
         Parse multiple RDF files.
         
+        Files are parsed in parallel worker processes; each worker returns its
+        triples as N-Triples which are merged into the graph here.
+        
         Args:
             file_paths: List of file paths to parse
             format: RDF format
+            backend: Parser backend passed to parse_file
+            max_workers: Number of worker processes (defaults to CPU count,
+                1 parses serially in this process)
+            optimize_workers: Spawn workers with PYTHONOPTIMIZE=1 so rdflib's
+                parser runs with asserts stripped (requires the calling
+                script to guard its entry point with __name__ == "__main__")
             
         Returns:
             Number of successfully parsed files
         """
         successful = 0
         total = len(file_paths)
-        
-        for i, file_path in enumerate(file_paths, 1):
-            self.logger.info(f"Processing file {i}/{total}: {file_path.name}")
-            if self.parse_file(file_path, format):
-                successful += 1
-            
-            # Progress indicator
-            if i % 10 == 0:
-                self.logger.info(f"Progress: {i}/{total} files processed")
+        max_workers = max_workers or os.cpu_count() or 1
+        
+        if max_workers == 1 or total <= 1:
+            for i, file_path in enumerate(file_paths, 1):
+                self.logger.debug("Processing file %d/%d: %s", i, total, file_path.name)
+                if self.parse_file(file_path, format, backend):
+                    successful += 1
+                
+                # Progress indicator
+                if i % PROGRESS_LOG_INTERVAL == 0:
+                    self.logger.info(f"Progress: {i}/{total} files processed")
+        else:
+            with self._worker_pool(min(max_workers, total), optimize_workers) as executor:
+                results = executor.map(
+                    _parse_one,
+                    file_paths,
+                    [format] * total,
+                    [backend] * total,
+                    chunksize=4
+                )
+                for i, (file_path, data) in enumerate(zip(file_paths, results), 1):
+                    self.logger.debug("Processing file %d/%d: %s", i, total, file_path.name)
+                    if data is not None:
+                        try:
+                            self.graph.parse(data=data, format='nt')
+                            self._graph_version += 1
+                            successful += 1
+                        except Exception as e:
+                            self.logger.error(f"Failed to merge {file_path}: {e}")
+                    
+                    # Progress indicator
+                    if i % PROGRESS_LOG_INTERVAL == 0:
+                        self.logger.info(f"Progress: {i}/{total} files processed")
         
         self.logger.info(f"Parsed {successful}/{total} files successfully")
         return successful
     
+    @contextmanager
+    def _worker_pool(self, max_workers: int, optimize: bool):
+        """Yield a process pool, optionally running the workers as python -O."""
+        if not optimize or sys.flags.optimize:
+            # Forked workers inherit the interpreter's own optimize level
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                yield executor
+            return
+        
+        # The optimize level is only read at interpreter startup, so the
+        # workers must be spawned fresh with the variable set
+        previous = os.environ.get('PYTHONOPTIMIZE')
+        os.environ['PYTHONOPTIMIZE'] = '1'
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                yield executor
+        finally:
+            if previous is None:
+                os.environ.pop('PYTHONOPTIMIZE', None)
+            else:
+                os.environ['PYTHONOPTIMIZE'] = previous
+    
     def get_graph_statistics(self) -> Dict[str, Any]:
         """Get statistics about the current graph."""
-        stats = {
+        # Collect everything in a single pass over the triples
+        subjects, predicates, objects = set(), set(), set()
+        compound_count = substance_count = 0
+        rdf_type = RDF.type
+        compound_type = URIRef(PUBCHEM_COMPOUND)
+        substance_type = URIRef(PUBCHEM_SUBSTANCE)
+        
+        for s, p, o in self.graph:
+            subjects.add(s)
+            predicates.add(p)
+            objects.add(o)
+            if p == rdf_type:
+                if o == compound_type:
+                    compound_count += 1
+                elif o == substance_type:
+                    substance_count += 1
+        
+        return {
             'total_triples': len(self.graph),
-            'subjects': len(set(self.graph.subjects())),
-            'predicates': len(set(self.graph.predicates())),
-            'objects': len(set(self.graph.objects())),
+            'subjects': len(subjects),
+            'predicates': len(predicates),
+            'objects': len(objects),
+            'compounds': compound_count,
+            'substances': substance_count
         }
+    
+    def stream_statistics(self, file_paths: List[Path], format: str = "turtle",
+                          backend: str = "rdflib") -> Dict[str, Any]:
+        """
+        Compute statistics over many files without keeping their triples.
         
-        # Count different types of entities
-        compound_count = len(list(self.graph.subjects(RDF.type, PUBCHEM_COMPOUND)))
-        substance_count = len(list(self.graph.subjects(RDF.type, PUBCHEM_SUBSTANCE)))
+        Each file is parsed into a scratch graph, folded into running
+        counters and discarded, so peak memory is bounded by the largest
+        file rather than the whole dataset. self.graph is left untouched.
         
-        stats.update({
+        Args:
+            file_paths: List of file paths to scan
+            format: RDF format
+            backend: Parser backend passed to parse_file
+            
+        Returns:
+            Dictionary with the same keys as get_graph_statistics plus
+            'files_parsed'; triples repeated across files are counted once
+            per file
+        """
+        subjects, predicates, objects = _UniqueCounter(), set(), _UniqueCounter()
+        total_triples = compound_count = substance_count = files_parsed = 0
+        rdf_type = RDF.type
+        compound_type = URIRef(PUBCHEM_COMPOUND)
+        substance_type = URIRef(PUBCHEM_SUBSTANCE)
+        
+        scratch = PubChemRDFParser(self.data_directory, self.parallelization)
+        for file_path in file_paths:
+            scratch.graph = Graph()
+            if not scratch.parse_file(file_path, format, backend):
+                continue
+            
+            files_parsed += 1
+            total_triples += len(scratch.graph)
+            for s, p, o in scratch.graph:
+                subjects.add(s)
+                predicates.add(p)
+                objects.add(o)
+                if p == rdf_type:
+                    if o == compound_type:
+                        compound_count += 1
+                    elif o == substance_type:
+                        substance_count += 1
+        
+        return {
+            'total_triples': total_triples,
+            'subjects': len(subjects),
+            'predicates': len(predicates),
+            'objects': len(objects),
             'compounds': compound_count,
-            'substances': substance_count
-        })
+            'substances': substance_count,
+            'files_parsed': files_parsed
+        }
+    
+    def count_instances(self, rdf_type: URIRef) -> int:
+        """
+        Count subjects of the given rdf:type using a store-level COUNT.
         
-        return stats
+        Args:
+            rdf_type: Class URI to count instances of
+            
+        Returns:
+            Number of matching subjects
+        """
+        result = self.graph.query(self._q_count, initBindings={'t': URIRef(rdf_type)})
+        return next(iter(result))[0].toPython()
     
     def query_compounds(self, limit: int = 10) -> List[Tuple[str, str]]:
         """
@@ -182,25 +541,17 @@ class PubChemRDFParser:
         Returns:
             List of tuples (compound_uri, label)
         """
-        query = f"""
-        PREFIX pubchem: <{PUBCHEM}>
-        PREFIX rdfs: <{RDFS}>
-        
-        SELECT ?compound ?label
-        WHERE {{
-            ?compound a pubchem:Compound .
-            OPTIONAL {{ ?compound rdfs:label ?label }}
-        }}
-        LIMIT {limit}
-        """
-        
+        return list(self._cached_compounds(limit, self._graph_version))
+    
+    def _query_compounds(self, limit: int, graph_version: int) -> Tuple[Tuple[str, str], ...]:
+        """Run the compound query; results are memoized by query_compounds."""
         results = []
-        for row in self.graph.query(query):
+        for row in islice(self.graph.query(self._q_compounds), limit):
             compound_uri = str(row.compound)
             label = str(row.label) if row.label else "No label"
             results.append((compound_uri, label))
         
-        return results
+        return tuple(results)
     
     def query_compound_properties(self, compound_uri: str) -> Dict[str, List[str]]:
         """
@@ -212,23 +563,18 @@ class PubChemRDFParser:
         Returns:
             Dictionary of properties and values
         """
-        query = f"""
-        SELECT ?property ?value
-        WHERE {{
-            <{compound_uri}> ?property ?value .
-        }}
-        """
-        
-        properties = {}
-        for row in self.graph.query(query):
-            prop = str(row.property)
-            value = str(row.value)
-            
-            if prop not in properties:
-                properties[prop] = []
-            properties[prop].append(value)
-        
-        return properties
+        cached = self._cached_props(compound_uri, self._graph_version)
+        return {prop: list(values) for prop, values in cached.items()}
+    
+    def _query_compound_properties(self, compound_uri: str,
+                                   graph_version: int) -> Dict[str, List[str]]:
+        """Collect the compound's properties; results are memoized by query_compound_properties."""
+        # A bound-subject lookup goes straight to the store index, no SPARQL needed
+        properties = defaultdict(list)
+        for prop, value in self.graph.predicate_objects(URIRef(compound_uri)):
+            properties[_s(prop)].append(str(value))
+        
+        return dict(properties)
     
     def extract_relationships(self) -> List[Tuple[str, str, str]]:
         """
@@ -237,45 +583,85 @@ class PubChemRDFParser:
         Returns:
             List of tuples (subject, predicate, object)
         """
-        relationships = []
-        
         # Limit to avoid memory issues with large graphs
-        count = 0
-        for s, p, o in self.graph:
-            if count >= 1000:  # Limit for demonstration
-                break
-            relationships.append((str(s), str(p), str(o)))
-            count += 1
+        return [(str(s), _s(p), str(o)) for s, p, o in islice(self.graph, 1000)]
+    
+    def extract_relationships_streaming(self, file_path: Path,
+                                        limit: int = 1000) -> List[Tuple[str, str, str]]:
+        """
+        Extract relationships straight from a line-oriented file without
+        building a graph.
+        
+        Each line is matched as an N-Triples statement, in the spirit of
+        line-at-a-time formats such as HDT/hextuples. Lines that are not
+        IRI-subject/IRI-predicate statements (prefixes, multi-line Turtle,
+        blank-node subjects) are skipped.
+        
+        Args:
+            file_path: Path to an .nt/.ttl file, optionally gzip-compressed
+            limit: Maximum number of relationships to return
+            
+        Returns:
+            List of tuples (subject, predicate, object)
+        """
+        relationships = []
+        if file_path.suffix == '.gz':
+            f = self._open_gzip(file_path)
+        else:
+            f = open(file_path, 'rb')
+        
+        with f:
+            for line in f:
+                match = NTRIPLE_LINE_RE.match(line)
+                if match is None:
+                    continue
+                
+                subject, predicate, obj = match.groups()
+                if obj.startswith(b'<') and obj.endswith(b'>'):
+                    obj = obj[1:-1]
+                else:
+                    literal = LITERAL_VALUE_RE.match(obj)
+                    if literal is not None:
+                        obj = literal.group(1)
+                
+                relationships.append((
+                    subject.decode('utf-8'),
+                    predicate.decode('utf-8'),
+                    obj.decode('utf-8')
+                ))
+                if len(relationships) >= limit:
+                    break
         
         return relationships
     
-    def create_networkx_graph(self, max_nodes: int = 100) -> 'nx.Graph':
+    def create_networkx_graph(self, max_nodes: int = 100) -> 'nx.DiGraph':
         """
-        Create a NetworkX graph from RDF data.
+        Create a directed NetworkX graph from RDF data.
         
         Args:
             max_nodes: Maximum number of nodes to include
             
         Returns:
-            NetworkX graph object
+            NetworkX directed graph object
         """
         if nx is None:
             raise ImportError("NetworkX not available")
         
-        G = nx.Graph()
-        node_count = 0
+        # Each edge contributes up to two nodes
+        max_edges = (max_nodes + 1) // 2
+        edges = []
         
         for s, p, o in self.graph:
-            if node_count >= max_nodes:
+            if len(edges) >= max_edges:
                 break
             
             # Only include URIRefs as nodes (skip literals for simplicity)
             if isinstance(s, URIRef) and isinstance(o, URIRef):
-                G.add_node(str(s), type='subject')
-                G.add_node(str(o), type='object')
-                G.add_edge(str(s), str(o), relation=str(p))
-                node_count += 2
+                edges.append((str(s), str(o), {'relation': _s(p)}))
         
+        # Nodes are added implicitly with their edges
+        G = nx.DiGraph()
+        G.add_edges_from(edges)
         return G
     
     def visualize_graph(self, G: 'nx.Graph', output_file: str = "pubchem_graph.png"):
@@ -299,7 +685,7 @@ class PubChemRDFParser:
         nx.draw_networkx_edges(G, pos, alpha=0.5, edge_color='gray')
         
         # Add labels for a few nodes
-        labels = {node: node.split('/')[-1][:10] for node in list(G.nodes())[:20]}
+        labels = {node: node.rsplit('/', 1)[-1][:10] for node in islice(G.nodes(), 20)}
         nx.draw_networkx_labels(G, pos, labels, font_size=8)
         
         plt.title("PubChem Knowledge Graph Sample")
@@ -314,17 +700,38 @@ class PubChemRDFParser:
         """
         Save the current graph to a file.
         
+        Output paths ending in .gz are compressed while serializing, using
+        multi-threaded pgzip when it is installed.
+        
         Args:
             output_file: Output file path
             format: RDF serialization format
         """
         try:
-            self.graph.serialize(destination=output_file, format=format)
+            if output_file.endswith('.gz'):
+                if pgzip is not None:
+                    f = pgzip.open(output_file, 'wb', thread=self.parallelization,
+                                   compresslevel=6)
+                else:
+                    f = gzip.open(output_file, 'wb', compresslevel=6)
+                with f:
+                    self.graph.serialize(destination=f, format=format)
+            else:
+                self.graph.serialize(destination=output_file, format=format)
             self.logger.info(f"Graph saved to {output_file} in {format} format")
         except Exception as e:
             self.logger.error(f"Failed to save graph: {e}")
 
 
+def _parse_one(file_path: Path, format: str, backend: str) -> Optional[bytes]:
+    """Parse one file in a worker process and return its triples as N-Triples."""
+    # Files are already spread across processes, so decompress single-threaded
+    parser = PubChemRDFParser(parallelization=1)
+    if not parser.parse_file(file_path, format, backend):
+        return None
+    return parser.graph.serialize(format='nt', encoding='utf-8')
+
+
 def setup_logging():
     """Set up logging for the demo."""
     logging.basicConfig(
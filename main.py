@@ -19,6 +19,7 @@ from src.utils.logging_setup import (
     cleanup_old_logs
 )
 from src.downloader.ftp_downloader import PubChemFTPDownloader
+from src.downloader.async_downloader import AsyncPubChemFTPDownloader
 
 
 def signal_handler(signum, frame):
@@ -140,6 +141,17 @@ def apply_cli_overrides(config, args):
         config['download']['local_data_dir'] = args.data_dir
 
 
+def create_downloader(config, logger=None):
+    """Create the downloader matching the configured backend."""
+    if config['download'].get('backend', 'threads') == 'asyncio':
+        try:
+            return AsyncPubChemFTPDownloader(config)
+        except ImportError as e:
+            if logger:
+                logger.warning(f"{e}; falling back to threaded downloader")
+    return PubChemFTPDownloader(config)
+
+
 def show_download_status(config):
     """Show current download status."""
     try:
@@ -245,7 +257,7 @@ def main():
             return 0 if show_download_status(config) else 1
         
         # Create downloader
-        downloader = PubChemFTPDownloader(config)
+        downloader = create_downloader(config, logger)
         
         # Handle retry failed downloads
         if args.retry_failed:
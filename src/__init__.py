@@ -10,18 +10,24 @@ __author__ = "PubChem Downloader Team"
 __description__ = "Robust PubChem RDF data downloader and knowledge graph builder"
 
 from .downloader.ftp_downloader import PubChemFTPDownloader
+from .downloader.async_downloader import AsyncPubChemFTPDownloader
 from .utils.config_manager import ConfigManager
 from .utils.disk_monitor import DiskSpaceMonitor
-from .utils.rate_limiter import RateLimiter, AdaptiveRateLimiter
+from .utils.rate_limiter import RateLimiter, AdaptiveRateLimiter, ShardedRateLimiter, AsyncRateLimiter
+from .utils.concurrency_limiter import AdaptiveConcurrencyLimiter
 from .utils.progress_tracker import ProgressTracker
 from .utils.logging_setup import setup_logging
 
 __all__ = [
     'PubChemFTPDownloader',
+    'AsyncPubChemFTPDownloader',
     'ConfigManager',
     'DiskSpaceMonitor',
     'RateLimiter',
     'AdaptiveRateLimiter',
+    'ShardedRateLimiter',
+    'AsyncRateLimiter',
+    'AdaptiveConcurrencyLimiter',
     'ProgressTracker',
     'setup_logging'
 ] 
\ No newline at end of file
@@ -3,7 +3,9 @@ Download modules for PubChem RDF data.
 """
 
 from .ftp_downloader import PubChemFTPDownloader
+from .async_downloader import AsyncPubChemFTPDownloader
 
 __all__ = [
-    'PubChemFTPDownloader'
+    'PubChemFTPDownloader',
+    'AsyncPubChemFTPDownloader'
 ] 
\ No newline at end of file
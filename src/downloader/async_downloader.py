@@ -0,0 +1,419 @@
+"""
+Asyncio FTP downloader for PubChem RDF data built on aioftp.
+
+Directory listing, progress tracking and retry bookkeeping are shared with
+the threaded downloader; only the transfer pipeline runs on an event loop,
+so many RETRs can be in flight without a thread per download. Blocking
+work (the ftplib listing, file I/O and progress tracker calls) is handed
+to the default executor so it never stalls the loop.
+"""
+
+import os
+import ftplib
+import asyncio
+import functools
+import threading
+from typing import Optional, Tuple
+
+try:
+    import aioftp
+except ImportError:
+    aioftp = None
+
+from .ftp_downloader import (
+    PubChemFTPDownloader, _ChunkSink, DISK_CHECK_INVALIDATE_BYTES, LISTING_BUFFER_ENTRIES
+)
+from ..utils.rate_limiter import AdaptiveRateLimiter, ShardedRateLimiter, AsyncRateLimiter
+
+
+# asyncio.to_thread is Python 3.9+; older loops use the default executor directly
+if hasattr(asyncio, 'to_thread'):
+    _to_thread = asyncio.to_thread
+else:
+    async def _to_thread(func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+class _ShutdownEvent(threading.Event):
+    """
+    threading.Event that coroutines on one bound event loop can also await.
+    
+    set() may be called from any thread and wakes wait_async() callers
+    through call_soon_threadsafe, so retry backoffs end as soon as a
+    shutdown is requested.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_event: Optional[asyncio.Event] = None
+    
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop]):
+        """Attach to the running loop (None detaches)."""
+        self._loop = loop
+        self._async_event = asyncio.Event() if loop is not None else None
+        if loop is not None and self.is_set():
+            self._async_event.set()
+    
+    def set(self):
+        super().set()
+        loop, async_event = self._loop, self._async_event
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(async_event.set)
+            except RuntimeError:
+                pass  # The loop has already closed
+    
+    async def wait_async(self, timeout: float) -> bool:
+        """Wait up to timeout seconds on the bound loop; return whether the event is set."""
+        try:
+            await asyncio.wait_for(self._async_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.is_set()
+
+
+class AsyncPubChemFTPDownloader(PubChemFTPDownloader):
+    """PubChem FTP downloader that transfers files with asyncio and aioftp."""
+    
+    def __init__(self, config: dict):
+        """Initialize the asyncio downloader with configuration."""
+        if aioftp is None:
+            raise ImportError("aioftp not installed. Install with: pip install aioftp")
+        super().__init__(config)
+        
+        # Coroutines all run on the event loop thread, so they never contend
+        # on the limiter lock and would all land on one shard
+        if isinstance(self.rate_limiter, ShardedRateLimiter):
+            self.logger.warning(
+                f"rate_limit_shards={config['download']['rate_limit_shards']} has no effect "
+                f"with the asyncio backend; using a single rate limiter"
+            )
+            self.rate_limiter = AdaptiveRateLimiter(
+                initial_delay=config['download']['rate_limit_delay'],
+                min_delay=0.5,
+                max_delay=30.0,
+                jitter=config['download'].get('rate_limit_jitter', 'full')
+            )
+        self.async_rate_limiter = AsyncRateLimiter(self.rate_limiter)
+        self._shutdown_event = _ShutdownEvent()
+        
+        # Wakes workers waiting for a concurrency slot; created on the loop
+        self._slot_freed: Optional[asyncio.Condition] = None
+    
+    async def _create_async_client(self) -> 'aioftp.Client':
+        """Create, connect and log in an aioftp client."""
+        client = aioftp.Client(socket_timeout=self.ftp_timeout,
+                               connection_timeout=self.ftp_timeout)
+        try:
+            await client.connect(self.ftp_host, ftplib.FTP_PORT)
+            await client.login()  # Anonymous login
+            return client
+        except Exception as e:
+            client.close()
+            self.logger.error(f"Failed to create async FTP connection: {e}")
+            raise
+    
+    def _resume_offset(self, local_path: str, temp_path: str,
+                       file_size: Optional[int]) -> Optional[int]:
+        """
+        Return the byte to resume a download from, or None if it is already complete.
+        
+        Called through the executor since it stats and may delete files.
+        """
+        # Check if file already exists and is complete
+        if os.path.exists(local_path) and file_size:
+            existing_size = os.path.getsize(local_path)
+            if existing_size == file_size:
+                self.logger.debug(f"File already complete: {local_path}")
+                return None
+            elif existing_size > file_size:
+                # File is larger than expected, remove it
+                os.remove(local_path)
+                self.logger.warning(f"Removed oversized file: {local_path}")
+        
+        # Resume download if partial file exists
+        if os.path.exists(temp_path):
+            start_byte = os.path.getsize(temp_path)
+            self.logger.debug(f"Resuming download from byte {start_byte}: {temp_path}")
+            return start_byte
+        return 0
+    
+    def _finish_download(self, remote_path: str, temp_path: str, local_path: str,
+                         file_size: Optional[int], validated: bool):
+        """Verify the temporary file and move it into place (run through the executor)."""
+        # Verify file size if known
+        if file_size:
+            actual_size = os.path.getsize(temp_path)
+            if actual_size != file_size:
+                raise Exception(f"File size mismatch: expected {file_size}, got {actual_size}")
+        
+        # Move completed file to final location
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        os.replace(temp_path, local_path)
+        if validated:
+            self.progress_tracker.mark_file_validated(remote_path)
+    
+    @staticmethod
+    def _remove_temp(temp_path: str):
+        """Delete a failed download's temporary file, if any."""
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    
+    async def _download_file_async(self, client: 'aioftp.Client', remote_path: str,
+                                   local_path: str, file_size: Optional[int] = None) -> bool:
+        """
+        Download a single file with resume capability over an aioftp session.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        # Create temporary file path
+        temp_path = os.path.join(self.temp_dir, os.path.basename(local_path) + '.tmp')
+        
+        try:
+            start_byte = await _to_thread(self._resume_offset, local_path, temp_path, file_size)
+            if start_byte is None:
+                return True
+            
+            reporter = self._progress_reporter(remote_path)
+            validator = self._gzip_validator(remote_path, start_byte)
+            f = await _to_thread(open, temp_path, 'ab' if start_byte > 0 else 'wb')
+            try:
+                # Each block is validated, written and reported off the loop
+                sink = _ChunkSink(f, reporter, validator, start_byte)
+                async with client.download_stream(remote_path, offset=start_byte) as stream:
+                    async for block in stream.iter_by_block(self.chunk_size):
+                        await _to_thread(sink, block)
+            finally:
+                await _to_thread(f.close)
+            if validator is not None:
+                await _to_thread(validator.close)
+            
+            await _to_thread(self._finish_download, remote_path, temp_path, local_path,
+                             file_size, validator is not None)
+            
+            self.logger.info(f"Successfully downloaded: {remote_path}")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Failed to download {remote_path}: {e}")
+            # Clean up temporary file on error
+            await _to_thread(self._remove_temp, temp_path)
+            return False
+    
+    async def _acquire_slot(self):
+        """Wait for a concurrency limiter slot without blocking the event loop."""
+        # Only this loop's workers use the limiter, and its limit changes only
+        # on release, so re-checking after each release never misses a slot
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(self.concurrency_limiter.try_acquire)
+    
+    async def _release_slot(self, success: bool):
+        """Return a concurrency limiter slot and wake the workers waiting for one."""
+        self.concurrency_limiter.release(success)
+        async with self._slot_freed:
+            self._slot_freed.notify_all()
+    
+    async def _download_attempts_async(self, client: Optional['aioftp.Client'], remote_path: str,
+                                       local_path: str, file_size: Optional[int] = None
+                                       ) -> Tuple[bool, int, Optional['aioftp.Client']]:
+        """
+        Try a download up to max_retries times with exponential backoff.
+        
+        Returns:
+            Tuple of (success, number of attempts made, session to reuse or None)
+        """
+        success = False
+        for attempt in range(self.max_retries):
+            try:
+                if client is None:
+                    client = await self._create_async_client()
+                
+                success = await self._download_file_async(client, remote_path,
+                                                          local_path, file_size)
+                if success:
+                    self.rate_limiter.on_success()
+                    await _to_thread(
+                        self.progress_tracker.update_file_progress,
+                        remote_path, file_size or os.path.getsize(local_path), "completed"
+                    )
+                    self._note_completed(remote_path)
+                    stats = self._thread_stats()
+                    stats['files_downloaded'] += 1
+                    stats['bytes_downloaded'] += file_size or 0
+                    if (file_size or 0) >= DISK_CHECK_INVALIDATE_BYTES:
+                        self.disk_monitor.invalidate()
+                    break
+                else:
+                    self.rate_limiter.on_error("download_failed")
+                    # The session may be mid-transfer; start the next attempt clean
+                    client.close()
+                    client = None
+            
+            except Exception as e:
+                error_msg = f"Download attempt {attempt + 1} failed for {remote_path}: {e}"
+                self.logger.warning(error_msg)
+                self.rate_limiter.on_error("connection_error")
+                if client is not None:
+                    client.close()
+                    client = None
+                
+                if attempt < self.max_retries - 1:
+                    # Wakes immediately if a shutdown is requested mid-backoff
+                    if await self._shutdown_event.wait_async(self._backoff_delay(attempt)):
+                        break
+        
+        return success, attempt + 1, client
+    
+    async def _download_file_with_retry_async(self, client: Optional['aioftp.Client'],
+                                              remote_path: str, local_path: str,
+                                              file_size: Optional[int] = None
+                                              ) -> Tuple[bool, Optional['aioftp.Client']]:
+        """
+        Download a file with retry logic and rate limiting on the event loop.
+        
+        Returns:
+            Tuple of (success, session to reuse or None)
+        """
+        # Check if already completed
+        if await _to_thread(self.progress_tracker.is_file_completed, remote_path):
+            self.logger.debug("Skipping already completed file: %s", remote_path)
+            self._thread_stats()['files_skipped'] += 1
+            return True, client
+        
+        # Check disk space before download
+        if not await _to_thread(self.disk_monitor.has_sufficient_space, self.local_data_dir):
+            self.logger.error("Insufficient disk space for download")
+            return False, client
+        
+        # Wait for a download slot, then apply rate limiting
+        await self._acquire_slot()
+        success, attempts = False, 0
+        try:
+            await self.async_rate_limiter.wait()
+            
+            # Add file to progress tracker
+            await _to_thread(self.progress_tracker.add_file, remote_path, local_path, file_size)
+            
+            success, attempts, client = await self._download_attempts_async(
+                client, remote_path, local_path, file_size
+            )
+        finally:
+            # A download that needed retries is a congestion signal too
+            await self._release_slot(success and attempts == 1)
+        
+        if not success:
+            await _to_thread(self.progress_tracker.set_file_error, remote_path,
+                             f"Failed after {self.max_retries} attempts")
+            self._record_failure(remote_path)
+        
+        return success, client
+    
+    async def _download_worker_async(self, work: asyncio.Queue):
+        """Download queued files over one lazily connected session until a None sentinel arrives."""
+        client = None
+        try:
+            while True:
+                entry = await work.get()
+                try:
+                    if entry is None:
+                        return
+                    if self._shutdown_event.is_set():
+                        continue  # Drain the queue without starting new transfers
+                    
+                    remote_path, local_path, size_bytes = entry
+                    try:
+                        success, client = await self._download_file_with_retry_async(
+                            client, remote_path, local_path, size_bytes
+                        )
+                        if success:
+                            self.logger.debug("Completed download: %s", remote_path)
+                        else:
+                            self.logger.error(f"Failed download: {remote_path}")
+                    except Exception as e:
+                        self.logger.error(f"Exception during download of {remote_path}: {e}")
+                finally:
+                    work.task_done()
+        finally:
+            if client is not None:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+    
+    def _list_directory(self, remote_dir: str):
+        """Drain a directory's pending files through the synchronous ftplib listing (run through the executor)."""
+        try:
+            return self._drain_listing(self._pending_files(remote_dir))
+        finally:
+            # The listing session is idle until the next directory, so release it
+            self._close_ftp_connections()
+    
+    async def _process_directory_async(self, work: asyncio.Queue, remote_dir: str) -> None:
+        """Feed one directory to the worker pool and wait for its transfers to finish."""
+        try:
+            local_dir = os.path.join(self.local_data_dir, os.path.basename(remote_dir))
+            
+            self.logger.info(f"Processing directory: {remote_dir}")
+            
+            # Add directory to progress tracker; totals are known once the listing ends
+            await _to_thread(self.progress_tracker.add_directory, remote_dir, local_dir)
+            
+            names, sizes, listing_error = await _to_thread(self._list_directory, remote_dir)
+            for filename, size_bytes in zip(names, sizes):
+                if self._shutdown_event.is_set():
+                    break
+                await work.put((f"{remote_dir}/{filename}", os.path.join(local_dir, filename), size_bytes))
+            await work.join()
+            
+            await _to_thread(self._record_directory_totals, remote_dir, names, sizes, listing_error)
+        
+        except Exception as e:
+            self.logger.error(f"Failed to process directory {remote_dir}: {e}")
+    
+    async def _download_directories_async(self) -> None:
+        """Download every configured directory with one worker pool on this event loop."""
+        self._shutdown_event.bind(asyncio.get_running_loop())
+        self._slot_freed = asyncio.Condition()
+        
+        # A fixed pool of workers, each reusing its own session across
+        # directories, pulls from one bounded queue fed by the listings
+        work: asyncio.Queue = asyncio.Queue(maxsize=LISTING_BUFFER_ENTRIES)
+        workers = [asyncio.ensure_future(self._download_worker_async(work))
+                   for _ in range(self.max_concurrent_downloads)]
+        try:
+            for directory in self.directories_to_download:
+                remote_dir = f"{self.ftp_base_path.rstrip('/')}/{directory}"
+                
+                # Check disk space before each directory
+                if not await _to_thread(self._has_space_for, directory):
+                    break
+                
+                await self._process_directory_async(work, remote_dir)
+                
+                # Print periodic progress
+                await _to_thread(self.progress_tracker.print_statistics)
+            
+            # The queue is drained, so every worker takes a sentinel and quits its session
+            for _ in workers:
+                await work.put(None)
+            await asyncio.gather(*workers)
+        
+        except BaseException:
+            # Stop the listing feeder and abandon retry backoffs
+            self._shutdown_event.set()
+            self.rate_limiter.shutdown()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            self._shutdown_event.bind(None)
+    
+    def _download_directories(self) -> None:
+        """Download every configured directory on a single event loop for the whole run."""
+        asyncio.run(self._download_directories_async())
@@ -4,20 +4,209 @@ rate limiting, disk space monitoring, and idempotent operations.
 """
 
 import os
+import re
 import ftplib
+import socket
+import select
 import gzip
+import zlib
 import time
+import random
 import logging
 import threading
-from typing import List, Optional, Tuple, Set
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from retrying import retry
+import queue
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from isal import isal_zlib as gzip_zlib  # SIMD-accelerated zlib
+except ImportError:
+    gzip_zlib = zlib
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
 
 from ..utils.disk_monitor import DiskSpaceMonitor
-from ..utils.rate_limiter import AdaptiveRateLimiter
+from ..utils.rate_limiter import AdaptiveRateLimiter, ShardedRateLimiter
+from ..utils.concurrency_limiter import AdaptiveConcurrencyLimiter
 from ..utils.progress_tracker import ProgressTracker
 
+# Kernel receive buffer requested for FTP data connections
+SOCKET_RCVBUF = 4 * 1024 * 1024
+
+# Retry backoff: base * 2**attempt seconds, capped, then jittered by 0.5-1.5x
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP = 60.0
+
+# Upper bound on decompressed bytes materialized per gzip validation step
+VALIDATE_MAX_OUTPUT = 1024 * 1024
+
+# Downloads at least this large invalidate the cached disk space check
+DISK_CHECK_INVALIDATE_BYTES = 100 * 1024 * 1024
+
+# Entries queued ahead of the download workers; the drained listing itself
+# is held in compact name/size arrays, not as queued tuples
+LISTING_BUFFER_ENTRIES = 4096
+
+# Minimum seconds between in-flight progress updates for one file
+PROGRESS_REPORT_INTERVAL = 1.0
+
+# Unix-style LIST line: permissions, size and the (possibly spaced) filename
+LIST_LINE_RE = re.compile(r'^(\S+)\s+\S+\s+\S+\s+\S+\s+(\d+)\s+\S+\s+\S+\s+\S+\s+(.*)$')
+
+# Counters kept in session statistics
+STAT_KEYS = ('files_downloaded', 'bytes_downloaded', 'files_failed', 'files_skipped')
+
+
+@lru_cache(maxsize=None)
+def _splice_supported() -> bool:
+    """Check once whether this kernel can splice from a socket into a pipe."""
+    if not hasattr(os, 'splice'):
+        return False
+    sender, receiver = socket.socketpair()
+    read_fd, write_fd = os.pipe()
+    try:
+        sender.sendall(b'\0')
+        return os.splice(receiver.fileno(), write_fd, 1) == 1
+    except OSError:
+        return False
+    finally:
+        sender.close()
+        receiver.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+class _BatchedWriter:
+    """
+    Coalesce received chunks into one os.writev call per batch, so a
+    download issues one write syscall per batch instead of one per chunk.
+    """
+    
+    __slots__ = ('fd', 'batch_size', 'position', '_pending')
+    
+    def __init__(self, fd: int, batch_size: int, position: int = 0):
+        self.fd = fd
+        self.batch_size = min(batch_size, os.sysconf('SC_IOV_MAX'))
+        self.position = position
+        self._pending: List[bytes] = []
+    
+    def write(self, data: bytes):
+        """Queue a chunk, flushing once the batch is full."""
+        self._pending.append(data)
+        self.position += len(data)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def tell(self) -> int:
+        """Return the file position including queued chunks."""
+        return self.position
+    
+    def flush(self):
+        """Write all queued chunks, retrying after partial writes."""
+        buffers = self._pending
+        self._pending = []
+        while buffers:
+            written = os.writev(self.fd, buffers)
+            # Drop fully written buffers and trim a partially written one
+            while buffers and written >= len(buffers[0]):
+                written -= len(buffers[0])
+                buffers.pop(0)
+            if written:
+                buffers[0] = memoryview(buffers[0])[written:]
+
+
+class _GzipValidator:
+    """
+    Check a gzip stream chunk by chunk as it downloads, so corruption and
+    CRC mismatches surface during the transfer instead of on a re-read.
+    Decompressed output is discarded.
+    """
+    
+    __slots__ = ('_decomp',)
+    
+    def __init__(self):
+        self._decomp = gzip_zlib.decompressobj(16 + zlib.MAX_WBITS)
+    
+    def feed(self, data: bytes):
+        """Validate the next chunk; raises zlib.error on corrupt data."""
+        while data:
+            if self._decomp.eof:
+                # Concatenated gzip members are valid gzip
+                self._decomp = gzip_zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._decomp.decompress(data, VALIDATE_MAX_OUTPUT)
+            data = self._decomp.unused_data if self._decomp.eof else self._decomp.unconsumed_tail
+    
+    def close(self):
+        """Finish validation; raises zlib.error if the stream is truncated."""
+        while not self._decomp.eof and self._decomp.decompress(b'', VALIDATE_MAX_OUTPUT):
+            pass
+        if not self._decomp.eof:
+            raise zlib.error("Truncated gzip stream")
+
+
+class _ProgressReporter:
+    """
+    Forward download progress to the tracker at most once per byte step or
+    time interval, instead of once per received chunk.
+    """
+    
+    __slots__ = ('progress_tracker', 'remote_path', 'byte_step', 'last_reported', 'last_time')
+    
+    def __init__(self, progress_tracker: ProgressTracker, remote_path: str, byte_step: int):
+        self.progress_tracker = progress_tracker
+        self.remote_path = remote_path
+        self.byte_step = byte_step
+        self.last_reported = 0
+        self.last_time = time.monotonic()
+    
+    def update(self, current_size: int):
+        """Report current_size if enough bytes or time have passed."""
+        now = time.monotonic()
+        if (current_size - self.last_reported >= self.byte_step or
+                now - self.last_time >= PROGRESS_REPORT_INTERVAL):
+            self.progress_tracker.update_file_progress(
+                self.remote_path, current_size, "downloading"
+            )
+            self.last_reported = current_size
+            self.last_time = now
+
+
+class _ChunkSink:
+    """
+    Per-chunk callback for a single-stream download.
+    
+    Write, validation and progress callables are bound once up front and
+    the file position is counted here, so each chunk costs one Python call
+    plus the bound calls it makes, with no tell() syscall.
+    """
+    
+    __slots__ = ('_write', '_feed', '_report', 'position')
+    
+    def __init__(self, writer, reporter: _ProgressReporter,
+                 validator: Optional[_GzipValidator] = None, position: int = 0):
+        self._write = writer.write
+        self._feed = validator.feed if validator is not None else None
+        self._report = reporter.update
+        self.position = position
+    
+    def __call__(self, data: bytes):
+        if self._feed is not None:
+            self._feed(data)
+        self._write(data)
+        self.position += len(data)
+        self._report(self.position)
+
 
 class PubChemFTPDownloader:
     """Robust FTP downloader for PubChem RDF data."""
@@ -33,15 +222,28 @@ class PubChemFTPDownloader:
             check_interval=config['storage']['check_space_interval']
         )
         
-        self.rate_limiter = AdaptiveRateLimiter(
-            initial_delay=config['download']['rate_limit_delay'],
-            min_delay=0.5,
-            max_delay=30.0
-        )
+        rate_limit_shards = config['download'].get('rate_limit_shards', 1)
+        if rate_limit_shards > 1:
+            self.rate_limiter = ShardedRateLimiter(
+                shards=rate_limit_shards,
+                initial_delay=config['download']['rate_limit_delay'],
+                min_delay=0.5,
+                max_delay=30.0,
+                jitter=config['download'].get('rate_limit_jitter', 'full')
+            )
+        else:
+            self.rate_limiter = AdaptiveRateLimiter(
+                initial_delay=config['download']['rate_limit_delay'],
+                min_delay=0.5,
+                max_delay=30.0,
+                jitter=config['download'].get('rate_limit_jitter', 'full')
+            )
         
         self.progress_tracker = ProgressTracker(
             progress_file=config['progress']['progress_file'],
-            save_interval=config['progress']['save_interval']
+            save_interval=config['progress']['save_interval'],
+            compact_interval=config['progress'].get('compact_interval', 300),
+            flush_interval=config['progress'].get('flush_interval', 1.0)
         )
         
         # Download settings
@@ -51,32 +253,121 @@ class PubChemFTPDownloader:
         self.temp_dir = config['download']['temp_dir']
         self.max_concurrent_downloads = config['download']['max_concurrent_downloads']
         self.chunk_size = config['download']['chunk_size']
+        self.write_batch_size = config['download'].get('write_batch_size', 0)
+        self.zero_copy = config['download'].get('zero_copy', False)
+        self.validate_files = config.get('rdf', {}).get('validate_files', False)
+        self.streams_per_file = config['download'].get('streams_per_file', 1)
+        self.stripe_threshold = config['download'].get('stripe_threshold_mb', 64) * 1024 * 1024
         self.max_retries = config['ftp']['retries']
         self.ftp_timeout = config['ftp']['timeout']
         
+        # max_concurrent_downloads is the ceiling; the live limit adapts to errors.
+        # Starting below it makes the limit ramp up one slot per busy window
+        self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+            floor=1,
+            ceiling=self.max_concurrent_downloads,
+            initial=config['download'].get('initial_concurrency', self.max_concurrent_downloads)
+        )
+        
         # Directories to download
         self.directories_to_download = config['directories_to_download']
         
         # Thread safety
         self.download_lock = threading.Lock()
-        self.stats_lock = threading.Lock()
-        
-        # Statistics
-        self.session_stats = {
-            'files_downloaded': 0,
-            'bytes_downloaded': 0,
-            'files_failed': 0,
-            'files_skipped': 0,
-            'errors': []
-        }
-        
-        # Ensure directories exist
-        Path(self.local_data_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.temp_dir).mkdir(parents=True, exist_ok=True)
-    
-    @retry(stop_max_attempt_number=3, wait_exponential_multiplier=1000)
+        self._shutdown_event = threading.Event()
+        
+        # Persistent FTP sessions, one per worker thread
+        self._thread_local = threading.local()
+        self._ftp_connections: List[ftplib.FTP] = []
+        self._mlsd_supported = True
+        
+        # Statistics, accumulated per worker thread and summed on read
+        self._stats_counters: List[Counter] = []
+        self._error_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._errors: List[str] = []
+        
+        # Bloom filter front-end for the completed-files skip check
+        self._completed_bloom = self._build_completed_bloom()
+        
+        # Ensure directories exist, registering them with the disk monitor
+        self.disk_monitor.ensure_path(self.local_data_dir)
+        self.disk_monitor.ensure_path(self.temp_dir)
+    
+    def _build_completed_bloom(self) -> Optional['ScalableBloomFilter']:
+        """Build a Bloom filter of paths already completed, if pybloom_live is installed."""
+        if ScalableBloomFilter is None:
+            return None
+        completed = self.progress_tracker.snapshot_completed()
+        bloom = ScalableBloomFilter(initial_capacity=max(len(completed), 1000),
+                                    error_rate=0.001,
+                                    mode=ScalableBloomFilter.LARGE_SET_GROWTH)
+        for remote_path in completed:
+            bloom.add(remote_path)
+        return bloom
+    
+    def _note_completed(self, remote_path: str):
+        """Add a file completed this session to the Bloom filter, so later listings skip it."""
+        bloom = self._completed_bloom
+        if bloom is not None:
+            # Scaling the filter is not thread-safe
+            with self.download_lock:
+                bloom.add(remote_path)
+    
+    def _completed_check(self) -> Callable[[str], bool]:
+        """
+        Return a predicate telling whether a remote path is already completed.
+        
+        With a Bloom filter, a miss means definitely not completed and only
+        hits consult the tracker; otherwise test against one snapshot rather
+        than locking the tracker for every file.
+        """
+        bloom = self._completed_bloom
+        if bloom is None:
+            return self.progress_tracker.snapshot_completed().__contains__
+        is_file_completed = self.progress_tracker.is_file_completed
+        return lambda remote_path: remote_path in bloom and is_file_completed(remote_path)
+    
+    def _thread_stats(self) -> Counter:
+        """Return this thread's statistics counter, registering it on first use."""
+        counter = getattr(self._thread_local, 'stats', None)
+        if counter is None:
+            # Every key is present up front so summing never sees the dict resize
+            counter = Counter(dict.fromkeys(STAT_KEYS, 0))
+            self._thread_local.stats = counter
+            self._stats_counters.append(counter)
+        return counter
+    
+    def _record_failure(self, remote_path: str):
+        """Count a failed file and queue its path for the session report."""
+        self._thread_stats()['files_failed'] += 1
+        self._error_queue.put(remote_path)
+    
+    def _aggregate_stats(self) -> dict:
+        """Sum the per-thread counters and drain queued errors."""
+        totals = dict.fromkeys(STAT_KEYS, 0)
+        for counter in list(self._stats_counters):
+            for key in STAT_KEYS:
+                totals[key] += counter[key]
+        while True:
+            try:
+                self._errors.append(self._error_queue.get_nowait())
+            except queue.Empty:
+                break
+        totals['errors'] = self._errors
+        return totals
+    
+    @property
+    def session_stats(self) -> dict:
+        """Session statistics summed across worker threads."""
+        return self._aggregate_stats()
+    
     def _create_ftp_connection(self) -> ftplib.FTP:
-        """Create and return an FTP connection."""
+        """
+        Create and return an FTP connection.
+        
+        Failures are not retried here; callers retry within their own
+        attempt loops so there is a single backoff schedule.
+        """
         try:
             ftp = ftplib.FTP(timeout=self.ftp_timeout)
             ftp.connect(self.ftp_host)
@@ -86,46 +377,324 @@ class PubChemFTPDownloader:
             self.logger.error(f"Failed to create FTP connection: {e}")
             raise
     
-    def _get_directory_listing(self, ftp: ftplib.FTP, remote_path: str) -> List[Tuple[str, str, int]]:
+    def _get_thread_ftp(self) -> ftplib.FTP:
         """
-        Get directory listing with file sizes.
+        Return this thread's FTP session, creating it on first use.
         
-        Returns:
-            List of tuples (filename, file_type, size_bytes)
+        A cached session is checked with NOOP and replaced if the server
+        has dropped it, so login is paid once per worker rather than per file.
         """
+        ftp = getattr(self._thread_local, 'ftp', None)
+        if ftp is not None:
+            try:
+                ftp.voidcmd('NOOP')
+                return ftp
+            except ftplib.all_errors + (AttributeError,) as e:
+                self.logger.debug(f"Cached FTP connection is no longer usable, reconnecting: {e}")
+                self._reset_thread_ftp()
+        
+        ftp = self._create_ftp_connection()
+        self._thread_local.ftp = ftp
+        self._thread_local.cwd = None
+        with self.download_lock:
+            self._ftp_connections.append(ftp)
+        return ftp
+    
+    def _reset_thread_ftp(self) -> None:
+        """Drop this thread's FTP session so the next use reconnects."""
+        ftp = getattr(self._thread_local, 'ftp', None)
+        self._thread_local.ftp = None
+        self._thread_local.cwd = None
+        if ftp is None:
+            return
+        
+        with self.download_lock:
+            if ftp in self._ftp_connections:
+                self._ftp_connections.remove(ftp)
         try:
+            ftp.close()
+        except Exception:
+            pass
+    
+    def _close_ftp_connections(self) -> None:
+        """Close every FTP session opened by worker threads."""
+        with self.download_lock:
+            connections = self._ftp_connections
+            self._ftp_connections = []
+        
+        self._thread_local.ftp = None
+        self._thread_local.cwd = None
+        for ftp in connections:
+            try:
+                ftp.quit()
+            except Exception:
+                try:
+                    ftp.close()
+                except Exception:
+                    pass
+    
+    def _change_directory(self, ftp: ftplib.FTP, remote_path: str) -> None:
+        """CWD into remote_path unless this thread's session is already there."""
+        if getattr(self._thread_local, 'cwd', None) != remote_path:
             ftp.cwd(remote_path)
-            files = []
+            self._thread_local.cwd = remote_path
+    
+    def _iter_lines(self, ftp: ftplib.FTP, command: str) -> Iterator[str]:
+        """Yield the lines of a text-mode transfer as they arrive."""
+        ftp.sendcmd('TYPE A')
+        with ftp.transfercmd(command) as conn, \
+                conn.makefile('r', encoding=ftp.encoding) as fp:
+            for line in fp:
+                yield line.rstrip('\r\n')
+        ftp.voidresp()
+    
+    def _list_mlsd(self, ftp: ftplib.FTP) -> Iterator[Tuple[str, str, int]]:
+        """List the current directory from machine-readable MLSD facts."""
+        ftp.sendcmd('OPTS MLST type;size;')
+        for line in self._iter_lines(ftp, 'MLSD'):
+            facts_found, _, filename = line.partition(' ')
+            facts = {}
+            for fact in facts_found[:-1].split(';'):
+                key, _, value = fact.partition('=')
+                facts[key.lower()] = value
+            entry_type = facts.get('type')
+            if entry_type == 'file':
+                yield filename, 'file', int(facts.get('size', 0))
+            elif entry_type == 'dir':
+                yield filename, 'directory', 0
+    
+    def _list_unix(self, ftp: ftplib.FTP) -> Iterator[Tuple[str, str, int]]:
+        """List the current directory by parsing Unix-style LIST output."""
+        for line in self._iter_lines(ftp, 'LIST'):
+            match = LIST_LINE_RE.match(line)
+            if match:
+                permissions, size_str, filename = match.groups()
+                
+                # Skip . and .. entries
+                if filename in ('.', '..'):
+                    continue
+                
+                # Directories might not have meaningful size
+                if permissions.startswith('d'):
+                    yield filename, 'directory', 0
+                else:
+                    yield filename, 'file', int(size_str)
+    
+    def _get_directory_listing(self, ftp: ftplib.FTP, remote_path: str) -> Iterator[Tuple[str, str, int]]:
+        """
+        Stream a directory listing with file sizes.
+        
+        Entries are yielded while the listing is still arriving, so the
+        caller must consume it fully before reusing the FTP session.
+        
+        Returns:
+            Iterator of tuples (filename, file_type, size_bytes)
+        """
+        try:
+            self._change_directory(ftp, remote_path)
             
-            def parse_line(line):
-                parts = line.split()
-                if len(parts) >= 9:
-                    permissions = parts[0]
-                    size_str = parts[4]
-                    filename = ' '.join(parts[8:])
-                    
-                    # Skip . and .. entries
-                    if filename in ['.', '..']:
-                        return
-                    
-                    # Determine if it's a directory or file
-                    is_directory = permissions.startswith('d')
-                    file_type = 'directory' if is_directory else 'file'
-                    
-                    # Parse size (directories might not have meaningful size)
-                    try:
-                        size_bytes = int(size_str) if not is_directory else 0
-                    except ValueError:
-                        size_bytes = 0
-                    
-                    files.append((filename, file_type, size_bytes))
+            if self._mlsd_supported:
+                yielded = 0
+                try:
+                    for entry in self._list_mlsd(ftp):
+                        yielded += 1
+                        yield entry
+                    return
+                except ftplib.error_perm as e:
+                    # Only 500/502 mean the server does not implement MLSD;
+                    # anything else (e.g. 550 for this directory) is not a
+                    # reason to stop using it, and a LIST retry after
+                    # partial output would repeat entries
+                    if yielded or str(e)[:3] not in ('500', '502'):
+                        raise
+                    self.logger.debug(f"MLSD not supported, falling back to LIST: {e}")
+                    self._mlsd_supported = False
             
-            ftp.retrlines('LIST', callback=parse_line)
-            return files
+            yield from self._list_unix(ftp)
             
         except Exception as e:
             self.logger.error(f"Failed to get directory listing for {remote_path}: {e}")
-            return []
+            # A listing cut off mid-transfer leaves the session unusable
+            self._reset_thread_ftp()
+            # Re-raise so a partial listing is not taken for the whole directory
+            raise
+    
+    def _tune_data_socket(self, conn: socket.socket):
+        """Enlarge the receive buffer of an FTP data connection."""
+        try:
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+        except OSError as e:
+            self.logger.debug(f"Could not set SO_RCVBUF on data connection: {e}")
+    
+    def _retrieve(self, ftp: ftplib.FTP, remote_path: str, callback, start_byte: int = 0):
+        """
+        Stream a file over a data connection in chunk_size reads.
+        
+        Equivalent to retrbinary, but enlarges the data socket's receive
+        buffer so large files are not throttled by the default TCP window.
+        """
+        ftp.voidcmd('TYPE I')
+        with ftp.transfercmd(f'RETR {remote_path}', start_byte or None) as conn:
+            self._tune_data_socket(conn)
+            while True:
+                data = conn.recv(self.chunk_size)
+                if not data:
+                    break
+                callback(data)
+        return ftp.voidresp()
+    
+    def _progress_reporter(self, remote_path: str) -> _ProgressReporter:
+        """Create a throttled progress reporter for one transfer."""
+        return _ProgressReporter(self.progress_tracker, remote_path,
+                                 max(self.chunk_size * 64, 4 * 1024 * 1024))
+    
+    def _download_striped(self, remote_path: str, temp_path: str, file_size: int):
+        """
+        Download a large file as parallel byte ranges written in place.
+        
+        Each stripe gets its own FTP session, starts with REST at its
+        offset and stops after its length, writing with os.pwrite into a
+        temp file preallocated to the full size.
+        """
+        stripe_size = -(-file_size // self.streams_per_file)
+        stripes = [(start, min(stripe_size, file_size - start))
+                   for start in range(0, file_size, stripe_size)]
+        progress_lock = threading.Lock()
+        reporter = self._progress_reporter(remote_path)
+        downloaded = 0
+        
+        def fetch(stripe: Tuple[int, int]):
+            nonlocal downloaded
+            start, length = stripe
+            end = start + length
+            ftp = self._create_ftp_connection()
+            try:
+                ftp.voidcmd('TYPE I')
+                with ftp.transfercmd(f'RETR {remote_path}', start or None) as conn:
+                    self._tune_data_socket(conn)
+                    offset = start
+                    while offset < end:
+                        data = conn.recv(min(self.chunk_size, end - offset))
+                        if not data:
+                            raise EOFError(f"Connection closed at byte {offset} of stripe {start}-{end}")
+                        os.pwrite(fd, data, offset)
+                        offset += len(data)
+                        with progress_lock:
+                            downloaded += len(data)
+                            reporter.update(downloaded)
+            finally:
+                # The transfer is cut short at the stripe end, so the session
+                # is not reusable
+                ftp.close()
+        
+        self.logger.debug(f"Downloading {remote_path} in {len(stripes)} parallel streams")
+        with open(temp_path, 'wb') as f:
+            fd = f.fileno()
+            if hasattr(os, 'posix_fallocate'):
+                # Reserve real extents up front instead of a sparse file that
+                # the stripes would fill in interleaved order
+                try:
+                    os.posix_fallocate(fd, 0, file_size)
+                except OSError as e:
+                    self.logger.debug(f"posix_fallocate failed, using a sparse file: {e}")
+                    f.truncate(file_size)
+            else:
+                f.truncate(file_size)
+            with ThreadPoolExecutor(max_workers=len(stripes)) as executor:
+                # Consuming the results re-raises the first stripe failure
+                list(executor.map(fetch, stripes))
+    
+    def _download_spliced(self, ftp: ftplib.FTP, remote_path: str, temp_path: str,
+                          start_byte: int = 0):
+        """
+        Download a file with os.splice, moving data socket -> pipe -> file
+        inside the kernel so received bytes are never copied to userspace.
+        """
+        reporter = self._progress_reporter(remote_path)
+        # splice rejects O_APPEND targets, so resume by seeking instead
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        read_fd, write_fd = os.pipe()
+        try:
+            os.ftruncate(fd, start_byte)
+            os.lseek(fd, start_byte, os.SEEK_SET)
+            if fcntl is not None and hasattr(fcntl, 'F_SETPIPE_SZ'):
+                try:
+                    fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, self.chunk_size)
+                except OSError:
+                    pass  # Capped by /proc/sys/fs/pipe-max-size
+            
+            ftp.voidcmd('TYPE I')
+            with ftp.transfercmd(f'RETR {remote_path}', start_byte or None) as conn:
+                self._tune_data_socket(conn)
+                position = start_byte
+                while True:
+                    try:
+                        received = os.splice(conn.fileno(), write_fd, self.chunk_size)
+                    except BlockingIOError:
+                        # The socket has a timeout, so its descriptor is non-blocking
+                        if not select.select([conn], [], [], self.ftp_timeout)[0]:
+                            raise socket.timeout(f"No data received for {self.ftp_timeout}s")
+                        continue
+                    if not received:
+                        break
+                    # Drain the pipe completely so the next read starts empty
+                    while received:
+                        moved = os.splice(read_fd, fd, received)
+                        received -= moved
+                        position += moved
+                    reporter.update(position)
+            ftp.voidresp()
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+            os.close(fd)
+    
+    def _gzip_validator(self, remote_path: str, start_byte: int) -> Optional[_GzipValidator]:
+        """Return a streaming validator for a .gz download, or None if not applicable."""
+        # A resumed transfer starts mid-stream, where the gzip header is absent
+        if self.validate_files and remote_path.endswith('.gz') and start_byte == 0:
+            return _GzipValidator()
+        return None
+    
+    def _download_single_stream(self, ftp: ftplib.FTP, remote_path: str, temp_path: str) -> bool:
+        """
+        Download a file over one data connection, resuming a partial temp file.
+        
+        Returns:
+            True if the data was validated as gzip while downloading
+        """
+        # Resume download if partial file exists
+        start_byte = 0
+        if os.path.exists(temp_path):
+            start_byte = os.path.getsize(temp_path)
+            self.logger.debug(f"Resuming download from byte {start_byte}: {remote_path}")
+        
+        # Validation needs the bytes in userspace, which splice avoids
+        validator = self._gzip_validator(remote_path, start_byte)
+        if validator is None and self.zero_copy and _splice_supported():
+            self._download_spliced(ftp, remote_path, temp_path, start_byte)
+            return False
+        
+        # Open file for writing (append mode for resume)
+        mode = 'ab' if start_byte > 0 else 'wb'
+        
+        with open(temp_path, mode, buffering=self.chunk_size) as f:
+            # Batch chunks into vectored writes when enabled
+            if self.write_batch_size > 1 and hasattr(os, 'writev'):
+                writer = _BatchedWriter(f.fileno(), self.write_batch_size, start_byte)
+            else:
+                writer = f
+            
+            sink = _ChunkSink(writer, self._progress_reporter(remote_path), validator, start_byte)
+            
+            # Download the file, resuming at start_byte if needed
+            self._retrieve(ftp, remote_path, sink, start_byte)
+            writer.flush()
+        
+        if validator is not None:
+            validator.close()
+            return True
+        return False
     
     def _download_file(self, ftp: ftplib.FTP, remote_path: str, local_path: str, 
                       file_size: Optional[int] = None) -> bool:
@@ -150,30 +719,12 @@ class PubChemFTPDownloader:
             # Create temporary file path
             temp_path = os.path.join(self.temp_dir, os.path.basename(local_path) + '.tmp')
             
-            # Resume download if partial file exists
-            start_byte = 0
-            if os.path.exists(temp_path):
-                start_byte = os.path.getsize(temp_path)
-                self.logger.debug(f"Resuming download from byte {start_byte}: {remote_path}")
-            
-            # Open file for writing (append mode for resume)
-            mode = 'ab' if start_byte > 0 else 'wb'
-            
-            with open(temp_path, mode) as f:
-                def callback(data):
-                    f.write(data)
-                    # Update progress
-                    current_size = f.tell()
-                    self.progress_tracker.update_file_progress(
-                        remote_path, current_size, "downloading"
-                    )
-                
-                # Set up resume if needed
-                if start_byte > 0:
-                    ftp.sendcmd(f'REST {start_byte}')
-                
-                # Download the file
-                ftp.retrbinary(f'RETR {remote_path}', callback, blocksize=self.chunk_size)
+            validated = False
+            if (file_size and file_size > self.stripe_threshold and
+                    self.streams_per_file > 1 and hasattr(os, 'pwrite')):
+                self._download_striped(remote_path, temp_path, file_size)
+            else:
+                validated = self._download_single_stream(ftp, remote_path, temp_path)
             
             # Verify file size if known
             if file_size:
@@ -184,6 +735,8 @@ class PubChemFTPDownloader:
             # Move completed file to final location
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             os.replace(temp_path, local_path)
+            if validated:
+                self.progress_tracker.mark_file_validated(remote_path)
             
             self.logger.info(f"Successfully downloaded: {remote_path}")
             return True
@@ -198,110 +751,215 @@ class PubChemFTPDownloader:
                     pass
             return False
     
-    def _download_file_with_retry(self, remote_path: str, local_path: str, 
-                                 file_size: Optional[int] = None) -> bool:
-        """Download a file with retry logic and rate limiting."""
-        # Check if already completed
-        if self.progress_tracker.is_file_completed(remote_path):
-            self.logger.debug(f"Skipping already completed file: {remote_path}")
-            with self.stats_lock:
-                self.session_stats['files_skipped'] += 1
-            return True
-        
-        # Check disk space before download
-        if not self.disk_monitor.has_sufficient_space(self.local_data_dir):
-            self.logger.error("Insufficient disk space for download")
-            return False
-        
-        # Apply rate limiting
-        self.rate_limiter.wait()
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Return a jittered exponential backoff for a retry attempt.
         
-        # Add file to progress tracker
-        self.progress_tracker.add_file(remote_path, local_path, file_size)
+        Jitter keeps workers that failed together from reconnecting in lockstep.
+        """
+        delay = min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.5)
+    
+    def _connect_with_retry(self) -> ftplib.FTP:
+        """Get this thread's FTP session, retrying connection failures with backoff."""
+        for attempt in range(self.max_retries):
+            try:
+                return self._get_thread_ftp()
+            except ftplib.all_errors as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                self.logger.warning(f"Connection attempt {attempt + 1} failed: {e}")
+                self.rate_limiter.on_error("connection_error")
+                if self._shutdown_event.wait(timeout=self._backoff_delay(attempt)):
+                    raise
+    
+    def _download_attempts(self, remote_path: str, local_path: str,
+                           file_size: Optional[int] = None) -> Tuple[bool, int]:
+        """
+        Try a download up to max_retries times with exponential backoff.
         
+        Returns:
+            Tuple of (success, number of attempts made)
+        """
         success = False
         for attempt in range(self.max_retries):
             try:
-                # Create FTP connection for this download
-                ftp = self._create_ftp_connection()
+                # Reuse this worker's FTP session across downloads
+                ftp = self._get_thread_ftp()
                 
-                try:
-                    success = self._download_file(ftp, remote_path, local_path, file_size)
-                    if success:
-                        self.rate_limiter.on_success()
-                        self.progress_tracker.update_file_progress(
-                            remote_path, file_size or os.path.getsize(local_path), "completed"
-                        )
-                        with self.stats_lock:
-                            self.session_stats['files_downloaded'] += 1
-                            self.session_stats['bytes_downloaded'] += file_size or 0
-                        break
-                    else:
-                        self.rate_limiter.on_error("download_failed")
-                        
-                finally:
-                    ftp.quit()
+                success = self._download_file(ftp, remote_path, local_path, file_size)
+                if success:
+                    self.rate_limiter.on_success()
+                    self.progress_tracker.update_file_progress(
+                        remote_path, file_size or os.path.getsize(local_path), "completed"
+                    )
+                    self._note_completed(remote_path)
+                    stats = self._thread_stats()
+                    stats['files_downloaded'] += 1
+                    stats['bytes_downloaded'] += file_size or 0
+                    if (file_size or 0) >= DISK_CHECK_INVALIDATE_BYTES:
+                        self.disk_monitor.invalidate()
+                    break
+                else:
+                    self.rate_limiter.on_error("download_failed")
+                    # The session may be mid-transfer; start the next attempt clean
+                    self._reset_thread_ftp()
                     
             except Exception as e:
                 error_msg = f"Download attempt {attempt + 1} failed for {remote_path}: {e}"
                 self.logger.warning(error_msg)
                 self.rate_limiter.on_error("connection_error")
+                self._reset_thread_ftp()
                 
                 if attempt < self.max_retries - 1:
-                    sleep_time = 2 ** attempt  # Exponential backoff
-                    time.sleep(sleep_time)
+                    # Wakes immediately if a shutdown is requested mid-backoff
+                    if self._shutdown_event.wait(timeout=self._backoff_delay(attempt)):
+                        break
+        
+        return success, attempt + 1
+    
+    def _download_file_with_retry(self, remote_path: str, local_path: str, 
+                                 file_size: Optional[int] = None) -> bool:
+        """Download a file with retry logic and rate limiting."""
+        # Check if already completed
+        if self.progress_tracker.is_file_completed(remote_path):
+            self.logger.debug("Skipping already completed file: %s", remote_path)
+            self._thread_stats()['files_skipped'] += 1
+            return True
+        
+        # Check disk space before download
+        if not self.disk_monitor.has_sufficient_space(self.local_data_dir):
+            self.logger.error("Insufficient disk space for download")
+            return False
+        
+        # Wait for a download slot, then apply rate limiting
+        self.concurrency_limiter.acquire()
+        success, attempts = False, 0
+        try:
+            self.rate_limiter.wait()
+            
+            # Add file to progress tracker
+            self.progress_tracker.add_file(remote_path, local_path, file_size)
+            
+            success, attempts = self._download_attempts(remote_path, local_path, file_size)
+        finally:
+            # A download that needed retries is a congestion signal too
+            self.concurrency_limiter.release(success and attempts == 1)
         
         if not success:
             self.progress_tracker.set_file_error(remote_path, f"Failed after {self.max_retries} attempts")
-            with self.stats_lock:
-                self.session_stats['files_failed'] += 1
-                self.session_stats['errors'].append(remote_path)
+            self._record_failure(remote_path)
         
         return success
     
+    def _download_worker(self, work: queue.Queue, remote_dir: str, local_dir: str):
+        """Download queued files until a None sentinel arrives."""
+        while True:
+            entry = work.get()
+            if entry is None:
+                return
+            if self._shutdown_event.is_set():
+                continue  # Drain the queue without starting new transfers
+            
+            filename, size_bytes = entry
+            remote_file_path = f"{remote_dir}/{filename}"
+            local_file_path = os.path.join(local_dir, filename)
+            try:
+                success = self._download_file_with_retry(remote_file_path, local_file_path, size_bytes)
+                if success:
+                    self.logger.debug("Completed download: %s", remote_file_path)
+                else:
+                    self.logger.error(f"Failed download: {remote_file_path}")
+            except Exception as e:
+                self.logger.error(f"Exception during download of {remote_file_path}: {e}")
+    
     def _download_directory_files(self, remote_dir: str, local_dir: str, 
-                                 files_to_download: List[Tuple[str, str, int]]) -> None:
-        """Download files from a directory using thread pool."""
-        if not files_to_download:
-            self.logger.info(f"No files to download in {remote_dir}")
-            return
+                                 files_to_download: Iterable[Tuple[str, str, int]]) -> None:
+        """
+        Download files from a directory using a pool of worker threads.
+        
+        The pending listing is drained into name/size arrays first, then fed
+        to the workers through a bounded queue.
+        """
+        self.logger.info(f"Starting download of files from {remote_dir}")
         
-        self.logger.info(f"Starting download of {len(files_to_download)} files from {remote_dir}")
+        # Add directory to progress tracker; totals are known once the listing ends
+        self.progress_tracker.add_directory(remote_dir, local_dir)
         
-        # Add directory to progress tracker
-        total_bytes = sum(size for _, _, size in files_to_download)
-        self.progress_tracker.add_directory(remote_dir, local_dir, len(files_to_download), total_bytes)
+        names, sizes, listing_error = self._drain_listing(files_to_download)
+        
+        work: queue.Queue = queue.Queue(maxsize=LISTING_BUFFER_ENTRIES)
         
-        # Use ThreadPoolExecutor for concurrent downloads
         with ThreadPoolExecutor(max_workers=self.max_concurrent_downloads) as executor:
-            future_to_file = {}
-            
-            for filename, file_type, size_bytes in files_to_download:
-                if file_type == 'file':
-                    remote_file_path = f"{remote_dir}/{filename}"
-                    local_file_path = os.path.join(local_dir, filename)
-                    
-                    future = executor.submit(
-                        self._download_file_with_retry,
-                        remote_file_path,
-                        local_file_path,
-                        size_bytes
-                    )
-                    future_to_file[future] = (remote_file_path, local_file_path)
+            for _ in range(self.max_concurrent_downloads):
+                executor.submit(self._download_worker, work, remote_dir, local_dir)
             
-            # Process completed downloads
-            for future in as_completed(future_to_file):
-                remote_path, local_path = future_to_file[future]
-                try:
-                    success = future.result()
-                    if success:
-                        self.logger.debug(f"Completed download: {remote_path}")
-                    else:
-                        self.logger.error(f"Failed download: {remote_path}")
-                except Exception as e:
-                    self.logger.error(f"Exception during download of {remote_path}: {e}")
+            try:
+                for entry in zip(names, sizes):
+                    work.put(entry)
+            except BaseException:
+                # Ctrl-C arrives as KeyboardInterrupt, or as SystemExit from
+                # main.py's signal handler; let workers drain the queue and
+                # abandon retry backoffs before the sentinels are queued
+                self._shutdown_event.set()
+                self.rate_limiter.shutdown()
+                raise
+            finally:
+                # Always stop the workers, even if the listing failed
+                for _ in range(self.max_concurrent_downloads):
+                    work.put(None)
+        
+        # Worker threads are gone once the pool exits, so close their sessions
+        self._close_ftp_connections()
         
-        self.logger.info(f"Finished downloading files from {remote_dir}")
+        self._record_directory_totals(remote_dir, names, sizes, listing_error)
+    
+    def _drain_listing(self, files_to_download: Iterable[Tuple[str, str, int]]
+                       ) -> Tuple[List[str], array, Optional[Exception]]:
+        """
+        Read a streamed listing to the end before any transfer starts.
+        
+        Holding the listing's data connection open behind busy workers lets
+        the server time it out, so the whole listing is read up front into
+        parallel name and size arrays (about one string per file).
+        
+        Returns:
+            Tuple of (names, sizes, the error that cut the listing short or None)
+        """
+        names: List[str] = []
+        sizes = array('q')
+        try:
+            for filename, _, size_bytes in files_to_download:
+                names.append(filename)
+                sizes.append(size_bytes)
+        except Exception as e:
+            return names, sizes, e
+        return names, sizes, None
+    
+    def _record_directory_totals(self, remote_dir: str, names: List[str], sizes: array,
+                                 listing_error: Optional[Exception]):
+        """Record a directory's totals, unless its listing was cut short."""
+        if listing_error is not None:
+            # The unlisted files are picked up when the directory is listed again
+            self.logger.error(f"Listing of {remote_dir} failed after {len(names)} files, "
+                              f"directory left incomplete: {listing_error}")
+        elif names:
+            self.progress_tracker.set_directory_totals(remote_dir, len(names), sum(sizes))
+            self.logger.info(f"Finished downloading {len(names)} files from {remote_dir}")
+        else:
+            self.logger.info(f"All files already downloaded in {remote_dir}")
+    
+    def _pending_files(self, remote_dir: str) -> Iterator[Tuple[str, str, int]]:
+        """Stream the listing of remote_dir, keeping only files not yet completed."""
+        ftp = self._connect_with_retry()
+        files_info = self._get_directory_listing(ftp, remote_dir)
+        
+        is_completed = self._completed_check()
+        return (
+            (filename, file_type, size_bytes)
+            for filename, file_type, size_bytes in files_info
+            if file_type == 'file' and not is_completed(f"{remote_dir}/{filename}")
+        )
     
     def _process_directory(self, remote_dir: str) -> None:
         """Process a single directory for download."""
@@ -310,37 +968,45 @@ class PubChemFTPDownloader:
             
             self.logger.info(f"Processing directory: {remote_dir}")
             
-            # Get directory listing
-            ftp = self._create_ftp_connection()
-            try:
-                files_info = self._get_directory_listing(ftp, remote_dir)
-            finally:
-                ftp.quit()
-            
-            if not files_info:
-                self.logger.warning(f"No files found in {remote_dir}")
-                return
-            
-            # Filter files that need to be downloaded
-            files_to_download = []
-            for filename, file_type, size_bytes in files_info:
-                if file_type == 'file':
-                    remote_file_path = f"{remote_dir}/{filename}"
-                    if not self.progress_tracker.is_file_completed(remote_file_path):
-                        files_to_download.append((filename, file_type, size_bytes))
-            
-            if files_to_download:
-                self.logger.info(f"Found {len(files_to_download)} new files to download in {remote_dir}")
-                self._download_directory_files(remote_dir, local_dir, files_to_download)
-            else:
-                self.logger.info(f"All files already downloaded in {remote_dir}")
+            self._download_directory_files(remote_dir, local_dir, self._pending_files(remote_dir))
                 
         except Exception as e:
             self.logger.error(f"Failed to process directory {remote_dir}: {e}")
     
+    def _has_space_for(self, directory: str) -> bool:
+        """Check disk space before a directory, cleaning temp files once if short."""
+        if self.disk_monitor.has_sufficient_space(self.local_data_dir):
+            return True
+        
+        self.logger.error(f"Insufficient disk space before downloading {directory}")
+        # Try cleaning up temp files
+        freed_space = self.disk_monitor.cleanup_temp_files(self.temp_dir)
+        if freed_space > 0:
+            self.logger.info(f"Freed {freed_space:.2f} GB of temp space")
+            if self.disk_monitor.has_sufficient_space(self.local_data_dir):
+                return True
+            self.logger.error("Still insufficient disk space after cleanup")
+        return False
+    
+    def _download_directories(self) -> None:
+        """Download each configured directory in turn, stopping when disk space runs out."""
+        for directory in self.directories_to_download:
+            remote_dir = f"{self.ftp_base_path.rstrip('/')}/{directory}"
+            
+            # Check disk space before each directory
+            if not self._has_space_for(directory):
+                break
+            
+            self._process_directory(remote_dir)
+            
+            # Print periodic progress
+            self.progress_tracker.print_statistics()
+    
     def download_all(self) -> bool:
         """Download all specified directories."""
         try:
+            self._shutdown_event.clear()
+            self.rate_limiter.resume()
             self.logger.info("Starting PubChem RDF download")
             self.logger.info(f"Directories to download: {self.directories_to_download}")
             
@@ -352,26 +1018,7 @@ class PubChemFTPDownloader:
             start_time = time.time()
             
             # Process each directory
-            for directory in self.directories_to_download:
-                remote_dir = f"{self.ftp_base_path.rstrip('/')}/{directory}"
-                
-                # Check disk space before each directory
-                if not self.disk_monitor.has_sufficient_space(self.local_data_dir):
-                    self.logger.error(f"Insufficient disk space before downloading {directory}")
-                    # Try cleaning up temp files
-                    freed_space = self.disk_monitor.cleanup_temp_files(self.temp_dir)
-                    if freed_space > 0:
-                        self.logger.info(f"Freed {freed_space:.2f} GB of temp space")
-                        if not self.disk_monitor.has_sufficient_space(self.local_data_dir):
-                            self.logger.error("Still insufficient disk space after cleanup")
-                            break
-                    else:
-                        break
-                
-                self._process_directory(remote_dir)
-                
-                # Print periodic progress
-                self.progress_tracker.print_statistics()
+            self._download_directories()
             
             # Final statistics
             duration = time.time() - start_time
@@ -384,33 +1031,44 @@ class PubChemFTPDownloader:
             return True
             
         except KeyboardInterrupt:
+            self._shutdown_event.set()
+            self.rate_limiter.shutdown()
             self.logger.info("Download interrupted by user")
             return False
+        except SystemExit:
+            # main.py's signal handler exits through sys.exit; stop the
+            # workers and their backoffs so the exit is not held up
+            self._shutdown_event.set()
+            self.rate_limiter.shutdown()
+            self.logger.info("Download interrupted by signal")
+            raise
         except Exception as e:
             self.logger.error(f"Download failed: {e}")
             return False
         finally:
             # Clean up
+            self._close_ftp_connections()
             self.progress_tracker.cleanup()
             if self.config['storage']['cleanup_temp_files']:
                 self.disk_monitor.cleanup_temp_files(self.temp_dir)
     
     def _print_session_stats(self):
         """Print session statistics."""
+        session_stats = self._aggregate_stats()
         print(f"\n{'='*60}")
         print("SESSION STATISTICS")
         print(f"{'='*60}")
-        print(f"Files Downloaded: {self.session_stats['files_downloaded']:,}")
-        print(f"Files Failed: {self.session_stats['files_failed']:,}")
-        print(f"Files Skipped: {self.session_stats['files_skipped']:,}")
-        print(f"Bytes Downloaded: {self.session_stats['bytes_downloaded'] / (1024**3):.2f} GB")
-        
-        if self.session_stats['errors']:
-            print(f"\nFailed Files ({len(self.session_stats['errors'])}):")
-            for error in self.session_stats['errors'][:10]:  # Show first 10
+        print(f"Files Downloaded: {session_stats['files_downloaded']:,}")
+        print(f"Files Failed: {session_stats['files_failed']:,}")
+        print(f"Files Skipped: {session_stats['files_skipped']:,}")
+        print(f"Bytes Downloaded: {session_stats['bytes_downloaded'] / (1024**3):.2f} GB")
+        
+        if session_stats['errors']:
+            print(f"\nFailed Files ({len(session_stats['errors'])}):")
+            for error in session_stats['errors'][:10]:  # Show first 10
                 print(f"  - {error}")
-            if len(self.session_stats['errors']) > 10:
-                print(f"  ... and {len(self.session_stats['errors']) - 10} more")
+            if len(session_stats['errors']) > 10:
+                print(f"  ... and {len(session_stats['errors']) - 10} more")
         
         print(f"{'='*60}\n")
     
@@ -434,6 +1092,8 @@ class PubChemFTPDownloader:
                 if self._download_file_with_retry(remote_path, local_path, file_size):
                     success_count += 1
         
+        self._close_ftp_connections()
+        
         self.logger.info(f"Successfully retried {success_count}/{len(failed_files)} files")
         return success_count == len(failed_files)
     
@@ -447,5 +1107,6 @@ class PubChemFTPDownloader:
             'progress': stats,
             'disk_usage': disk_info,
             'rate_limiter': rate_stats,
+            'concurrency_limiter': self.concurrency_limiter.get_stats(),
             'session_stats': self.session_stats
         } 
\ No newline at end of file
@@ -4,7 +4,8 @@ Utility modules for PubChem downloader.
 
 from .config_manager import ConfigManager
 from .disk_monitor import DiskSpaceMonitor
-from .rate_limiter import RateLimiter, AdaptiveRateLimiter
+from .rate_limiter import RateLimiter, AdaptiveRateLimiter, ShardedRateLimiter, AsyncRateLimiter
+from .concurrency_limiter import AdaptiveConcurrencyLimiter, AIMDStrategy
 from .progress_tracker import ProgressTracker, FileProgress, DirectoryProgress
 from .logging_setup import setup_logging, configure_library_loggers
 
@@ -13,6 +14,10 @@ __all__ = [
     'DiskSpaceMonitor', 
     'RateLimiter',
     'AdaptiveRateLimiter',
+    'ShardedRateLimiter',
+    'AsyncRateLimiter',
+    'AdaptiveConcurrencyLimiter',
+    'AIMDStrategy',
     'ProgressTracker',
     'FileProgress',
     'DirectoryProgress',
@@ -0,0 +1,109 @@
+"""
+Adaptive concurrency limiting for PubChem FTP downloads.
+"""
+
+import threading
+import logging
+
+
+class AIMDStrategy:
+    """Additive-increase / multiplicative-decrease update rule for a concurrency limit."""
+    
+    def __init__(self, increase: int = 1, decrease_factor: float = 0.5):
+        """
+        Initialize AIMD strategy.
+        
+        Args:
+            increase: Slots added after a saturated window of successes
+            decrease_factor: Factor applied to the limit on an error
+        """
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+    
+    def on_success(self, limit: int) -> int:
+        """Return the new limit after a saturated success window."""
+        return limit + self.increase
+    
+    def on_error(self, limit: int) -> int:
+        """Return the new limit after an error."""
+        return int(limit * self.decrease_factor)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Thread-safe limiter that discovers how many downloads may run at once."""
+    
+    def __init__(self, floor: int = 1, ceiling: int = 20, initial: int = 4,
+                 strategy: AIMDStrategy = None):
+        """
+        Initialize adaptive concurrency limiter.
+        
+        Args:
+            floor: Minimum number of concurrent downloads
+            ceiling: Maximum number of concurrent downloads
+            initial: Starting limit, clamped to [floor, ceiling]
+            strategy: Limit update rule (defaults to AIMDStrategy)
+        """
+        self.floor = floor
+        self.ceiling = ceiling
+        self.limit = max(floor, min(initial, ceiling))
+        self.strategy = strategy or AIMDStrategy()
+        self.in_flight = 0
+        self.success_count = 0
+        self.error_count = 0
+        self.condition = threading.Condition()
+        self.logger = logging.getLogger(__name__)
+    
+    def acquire(self):
+        """Block until a download slot is free, then take it."""
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+    
+    def try_acquire(self) -> bool:
+        """Take a download slot if one is free, without blocking."""
+        with self.condition:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release(self, success: bool):
+        """
+        Return a download slot and adapt the limit to its outcome.
+        
+        The limit grows only after a full window of successes (one per
+        slot) completed while every slot was busy, and is cut at most once
+        per window so a burst of failures from one episode counts once.
+        """
+        with self.condition:
+            saturated = self.in_flight >= self.limit
+            self.in_flight -= 1
+            old_limit = self.limit
+            
+            if success:
+                self.error_count = 0
+                if saturated:
+                    self.success_count += 1
+                if self.success_count >= self.limit:
+                    self.limit = min(self.ceiling, self.strategy.on_success(self.limit))
+                    self.success_count = 0
+            else:
+                self.success_count = 0
+                if self.error_count == 0:
+                    self.limit = max(self.floor, self.strategy.on_error(self.limit))
+                self.error_count = (self.error_count + 1) % old_limit
+            
+            if self.limit != old_limit:
+                self.logger.debug("Concurrency limit changed from %d to %d", old_limit, self.limit)
+            self.condition.notify_all()
+    
+    def get_stats(self) -> dict:
+        """Get concurrency limiter statistics."""
+        with self.condition:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'floor': self.floor,
+                'ceiling': self.ceiling
+            }
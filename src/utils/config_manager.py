@@ -8,6 +8,9 @@ import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# Use libyaml's C loader when PyYAML was built with it
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 class ConfigManager:
     """Manage configuration loading and validation."""
@@ -25,7 +28,7 @@ class ConfigManager:
                 raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
             
             with open(self.config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+                self.config = yaml.load(f, Loader=SafeLoader)
             
             # Validate configuration
             self._validate_config()
@@ -62,6 +65,12 @@ class ConfigManager:
             if key not in download_config:
                 raise ValueError(f"Missing required download configuration: {key}")
         
+        if download_config.get('backend', 'threads') not in ('threads', 'asyncio'):
+            raise ValueError("download.backend must be 'threads' or 'asyncio'")
+        
+        if download_config.get('rate_limit_jitter', 'full') not in ('full', 'equal', 'none'):
+            raise ValueError("download.rate_limit_jitter must be 'full', 'equal' or 'none'")
+        
         # Validate storage configuration
         storage_config = self.config['storage']
         if 'min_free_space_gb' not in storage_config:
@@ -80,6 +89,10 @@ class ConfigManager:
             ('ftp.retries', int, 1, 10),
             ('download.rate_limit_delay', float, 0.1, 60.0),
             ('download.max_concurrent_downloads', int, 1, 20),
+            ('download.initial_concurrency', int, 1, 20),
+            ('download.chunk_size', int, 8192, 16 * 1024 * 1024),
+            ('download.streams_per_file', int, 1, 16),
+            ('download.rate_limit_shards', int, 1, 64),
             ('storage.min_free_space_gb', float, 1.0, 10000.0),
             ('progress.save_interval', int, 1, 1000)
         ]
@@ -211,8 +224,15 @@ class ConfigManager:
                 'temp_dir': 'data/temp',
                 'max_concurrent_downloads': 3,
                 'rate_limit_delay': 2.0,
-                'chunk_size': 8192,
-                'resume_downloads': True
+                'rate_limit_jitter': 'full',
+                'rate_limit_shards': 1,
+                'chunk_size': 1048576,
+                'resume_downloads': True,
+                'streams_per_file': 1,
+                'stripe_threshold_mb': 64,
+                'zero_copy': False,
+                'write_batch_size': 0,
+                'backend': 'threads'
             },
             'storage': {
                 'min_free_space_gb': 50,
@@ -229,6 +249,8 @@ class ConfigManager:
             },
             'progress': {
                 'save_interval': 10,
+                'compact_interval': 300,
+                'flush_interval': 1.0,
                 'progress_file': 'data/download_progress.json'
             },
             'rdf': {
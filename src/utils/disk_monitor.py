@@ -3,28 +3,101 @@ Disk space monitoring utilities for PubChem downloader.
 """
 
 import os
+import time
+import shutil
+import subprocess
 import logging
 import psutil
-from typing import Optional
-from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_GB = 1 << 30  # bytes per GiB
+
+
+def _disk_usage(path: str) -> Tuple[int, int, int]:
+    """
+    Return (total, used, free) bytes for the filesystem holding path.
+    
+    Calls statvfs directly where available; free counts only blocks
+    available to unprivileged users, matching psutil.disk_usage.
+    """
+    if hasattr(os, 'statvfs'):
+        st = os.statvfs(path)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        return total, used, st.f_bavail * st.f_frsize
+    
+    usage = psutil.disk_usage(path)
+    return usage.total, usage.used, usage.free
+
+
+# coreutils du walks with fts and batched getdents, well ahead of
+# per-entry Python stats on NFS-backed trees
+_DU = shutil.which('du') if os.name == 'posix' else None
+
+
+def _du_bytes(path: str) -> Optional[int]:
+    """
+    Return the apparent size of a tree in bytes via ``du -sb``, or None.
+    
+    None means du is unavailable or failed (e.g. BSD du lacks -b) and
+    the caller should fall back to scanning in Python.
+    """
+    if _DU is None:
+        return None
+    try:
+        output = subprocess.run(
+            [_DU, '-sb', path], capture_output=True, check=True, timeout=600
+        ).stdout
+        return int(output.split()[0])
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        return None
 
 
 class DiskSpaceMonitor:
     """Monitor disk space and prevent downloads when space is insufficient."""
     
-    def __init__(self, min_free_space_gb: float = 50.0, check_interval: int = 60):
+    def __init__(self, min_free_space_gb: float = 50.0, check_interval: int = 60,
+                 parallel_workers: int = 16):
         """
         Initialize disk space monitor.
         
         Args:
             min_free_space_gb: Minimum free space required in GB
             check_interval: Interval between checks in seconds
+            parallel_workers: Threads used to unlink files during cleanup
         """
         self.min_free_space_gb = min_free_space_gb
-        self.min_free_space_bytes = min_free_space_gb * 1024 * 1024 * 1024
+        self.min_free_space_bytes = min_free_space_gb * _GB
         self.check_interval = check_interval
+        self.parallel_workers = parallel_workers
         self.logger = logging.getLogger(__name__)
         
+        # (path, required_space_gb) -> time of the last passing check
+        self._sufficient_checks = {}
+        
+        # Free-space readings shared by every path on the same filesystem
+        self._cache_ttl = 1.0
+        self._cache: Dict[int, Tuple[float, float]] = {}  # st_dev -> (timestamp, free_gb)
+        self._ensured: Dict[str, int] = {}  # path -> st_dev, once created
+    
+    def ensure_path(self, path: str) -> int:
+        """
+        Create a monitored directory once and remember its filesystem.
+        
+        Call this during setup so get_free_space never has to create paths;
+        unregistered paths are still created lazily on their first check.
+        
+        Args:
+            path: Directory to create
+            
+        Returns:
+            Device id of the filesystem holding path
+        """
+        os.makedirs(path, exist_ok=True)
+        device = self._ensured[path] = os.stat(path).st_dev
+        return device
+        
     def get_free_space(self, path: str) -> float:
         """
         Get free space for the given path in GB.
@@ -36,18 +109,28 @@ class DiskSpaceMonitor:
             Free space in GB
         """
         try:
-            # Ensure path exists
-            Path(path).mkdir(parents=True, exist_ok=True)
+            # Paths are normally registered up front via ensure_path
+            device = self._ensured.get(path)
+            if device is None:
+                device = self.ensure_path(path)
+            
+            # Serve rapid successive checks from the per-filesystem cache
+            cached = self._cache.get(device)
+            now = time.monotonic()
+            if cached is not None and now - cached[0] < self._cache_ttl:
+                return cached[1]
             
             # Get disk usage statistics
-            usage = psutil.disk_usage(path)
-            free_gb = usage.free / (1024 * 1024 * 1024)
+            free_gb = _disk_usage(path)[2] / _GB
+            self._cache[device] = (now, free_gb)
             
-            self.logger.debug(f"Free space at {path}: {free_gb:.2f} GB")
+            self.logger.debug("Free space at %s: %.2f GB", path, free_gb)
             return free_gb
             
         except Exception as e:
             self.logger.error(f"Failed to get disk space for {path}: {e}")
+            # The path may have been removed; recreate it on the next check
+            self._ensured.pop(path, None)
             return 0.0
     
     def has_sufficient_space(self, path: str, required_space_gb: Optional[float] = None) -> bool:
@@ -63,11 +146,20 @@ class DiskSpaceMonitor:
         """
         if required_space_gb is None:
             required_space_gb = self.min_free_space_gb
+        
+        # A passing check is trusted for check_interval seconds; failing
+        # checks are never cached so freed space is noticed immediately
+        key = (path, required_space_gb)
+        checked_at = self._sufficient_checks.get(key)
+        if checked_at is not None and time.monotonic() - checked_at < self.check_interval:
+            return True
             
         free_space_gb = self.get_free_space(path)
         sufficient = free_space_gb >= required_space_gb
         
-        if not sufficient:
+        if sufficient:
+            self._sufficient_checks[key] = time.monotonic()
+        else:
             self.logger.warning(
                 f"Insufficient disk space. Required: {required_space_gb:.2f} GB, "
                 f"Available: {free_space_gb:.2f} GB"
@@ -75,6 +167,78 @@ class DiskSpaceMonitor:
         
         return sufficient
     
+    def invalidate(self):
+        """Forget cached space checks, e.g. after a large write."""
+        self._sufficient_checks.clear()
+        self._cache.clear()
+    
+    def _scan_size(self, path: str) -> int:
+        """Sum file sizes under path in bytes using scandir's cached entry data."""
+        total = 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        total += self._scan_size(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass  # Entry vanished or is unreadable
+        return total
+    
+    def _collect_tree(self, path: str, files: List[Tuple[str, int]], dirs: List[str]):
+        """Gather (file path, size) pairs and directory paths (deepest first) below path."""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        self._collect_tree(entry.path, files, dirs)
+                        dirs.append(entry.path)
+                    else:
+                        files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+                except OSError:
+                    pass  # Entry vanished or is unreadable
+    
+    def _unlink(self, path: str, size: int) -> int:
+        """Remove one file, returning the bytes freed (0 on failure)."""
+        try:
+            os.unlink(path)
+            return size
+        except OSError as e:
+            self.logger.debug("Failed to remove temp file %s: %s", os.path.basename(path), e)
+            return 0
+    
+    def _remove_contents(self, path: str) -> int:
+        """
+        Remove everything below path, unlinking files in parallel.
+        
+        Returns:
+            Bytes freed by the files that were removed
+        """
+        files: List[Tuple[str, int]] = []
+        dirs: List[str] = []
+        self._collect_tree(path, files, dirs)
+        freed = 0
+        
+        # Each unlink is a blocking metadata round-trip, so keep many in flight
+        if len(files) > 1 and self.parallel_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
+                futures = [executor.submit(self._unlink, file_path, size) for file_path, size in files]
+                for future in as_completed(futures):
+                    freed += future.result()
+        else:
+            for file_path, size in files:
+                freed += self._unlink(file_path, size)
+        
+        # Directories go bottom-up on one thread so parents never race children
+        for dir_path in dirs:
+            try:
+                os.rmdir(dir_path)
+            except OSError as e:
+                self.logger.debug("Failed to remove temp dir %s: %s", os.path.basename(dir_path), e)
+        
+        return freed
+    
     def get_directory_size(self, path: str) -> float:
         """
         Get the total size of a directory in GB.
@@ -86,15 +250,14 @@ class DiskSpaceMonitor:
             Directory size in GB
         """
         try:
-            total_size = 0
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    if os.path.exists(filepath):
-                        total_size += os.path.getsize(filepath)
-            
-            size_gb = total_size / (1024 * 1024 * 1024)
-            self.logger.debug(f"Directory {path} size: {size_gb:.2f} GB")
+            # du -sb sums apparent sizes like the scan below, plus the
+            # directory entries themselves (a few KB per directory)
+            total_size = _du_bytes(path)
+            if total_size is None:
+                total_size = self._scan_size(path)
+            
+            size_gb = total_size / _GB
+            self.logger.debug("Directory %s size: %.2f GB", path, size_gb)
             return size_gb
             
         except Exception as e:
@@ -115,24 +278,9 @@ class DiskSpaceMonitor:
             if not os.path.exists(temp_dir):
                 return 0.0
                 
-            initial_size = self.get_directory_size(temp_dir)
-            
-            # Remove all files in temp directory
-            for root, dirs, files in os.walk(temp_dir, topdown=False):
-                for file in files:
-                    try:
-                        os.remove(os.path.join(root, file))
-                    except Exception as e:
-                        self.logger.debug(f"Failed to remove temp file {file}: {e}")
-                        
-                for dir in dirs:
-                    try:
-                        os.rmdir(os.path.join(root, dir))
-                    except Exception as e:
-                        self.logger.debug(f"Failed to remove temp dir {dir}: {e}")
-            
-            final_size = self.get_directory_size(temp_dir)
-            freed_space = initial_size - final_size
+            # Remove all files in temp directory, counting sizes as they go
+            freed_space = self._remove_contents(temp_dir) / _GB
+            self.invalidate()
             
             self.logger.info(f"Cleaned up {freed_space:.2f} GB from temp directory")
             return freed_space
@@ -152,15 +300,15 @@ class DiskSpaceMonitor:
             Dictionary with disk usage information
         """
         try:
-            usage = psutil.disk_usage(path)
+            total, used, free = _disk_usage(path)
             
             return {
-                'total_gb': usage.total / (1024 * 1024 * 1024),
-                'used_gb': usage.used / (1024 * 1024 * 1024),
-                'free_gb': usage.free / (1024 * 1024 * 1024),
-                'percent_used': (usage.used / usage.total) * 100,
-                'percent_free': (usage.free / usage.total) * 100,
-                'sufficient_space': usage.free >= self.min_free_space_bytes
+                'total_gb': total / _GB,
+                'used_gb': used / _GB,
+                'free_gb': free / _GB,
+                'percent_used': (used / total) * 100,
+                'percent_free': (free / total) * 100,
+                'sufficient_space': free >= self.min_free_space_bytes
             }
             
         except Exception as e:
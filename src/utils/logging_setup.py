@@ -3,11 +3,71 @@ Logging setup utilities for PubChem downloader.
 """
 
 import os
+import time
+import queue
+import atexit
 import logging
 import logging.handlers
 from typing import Dict, Any
 from pathlib import Path
 
+_MB = 1 << 20  # bytes per MiB
+_GB = 1 << 30  # bytes per GiB
+
+# Background listeners by logger name, so re-configuring a logger stops its old one
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _attach_queued(logger: logging.Logger, *handlers: logging.Handler):
+    """
+    Attach handlers to a logger behind a queue drained by a background thread.
+    
+    Callers only pay for an enqueue; formatting and file/console writes
+    (including rotation) happen on the listener thread.
+    
+    Args:
+        logger: Logger to attach to
+        handlers: Handlers that do the actual output
+    """
+    old_listener = _listeners.pop(logger.name, None)
+    if old_listener is not None:
+        old_listener.stop()
+        for handler in old_listener.handlers:
+            handler.close()
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[logger.name] = listener
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the asctime seconds part once per second."""
+    
+    def __init__(self, fmt: str = None, datefmt: str = None):
+        super().__init__(fmt, datefmt, style='%')
+        self._cached_second = None
+        self._cached_text = ''
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_text = time.strftime(self.default_time_format, self.converter(second))
+            self._cached_second = second
+        return self.default_msec_format % (self._cached_text, record.msecs)
+
+
+@atexit.register
+def _stop_listeners():
+    """Flush queued records and stop the listener threads at exit."""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
 
 def setup_logging(config: Dict[str, Any]) -> logging.Logger:
     """
@@ -40,17 +100,23 @@ def setup_logging(config: Dict[str, Any]) -> logging.Logger:
     # Clear any existing handlers
     logger.handlers.clear()
     
+    # Skip collecting record fields the format never prints
+    if 'thread' not in log_format:
+        logging.logThreads = False
+    if 'process' not in log_format:
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+    
     # Create formatter
-    formatter = logging.Formatter(log_format)
+    formatter = CachedTimeFormatter(log_format)
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(getattr(logging, log_level, logging.INFO))
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
     
     # File handler with rotation
-    max_bytes = max_log_size_mb * 1024 * 1024  # Convert MB to bytes
+    max_bytes = max_log_size_mb * _MB  # Convert MB to bytes
     file_handler = logging.handlers.RotatingFileHandler(
         log_file,
         maxBytes=max_bytes,
@@ -59,7 +125,7 @@ def setup_logging(config: Dict[str, Any]) -> logging.Logger:
     )
     file_handler.setLevel(getattr(logging, log_level, logging.INFO))
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    _attach_queued(logger, console_handler, file_handler)
     
     # Create a specific logger for the application
     app_logger = logging.getLogger('pubchem_downloader')
@@ -90,18 +156,18 @@ def create_progress_logger(log_file: str = "logs/download_progress.log") -> logg
     progress_logger.handlers.clear()
     
     # Create formatter for progress logs
-    formatter = logging.Formatter('%(asctime)s - %(message)s')
+    formatter = CachedTimeFormatter('%(asctime)s - %(message)s')
     
     # File handler for progress
     file_handler = logging.handlers.RotatingFileHandler(
         log_file,
-        maxBytes=50 * 1024 * 1024,  # 50MB
+        maxBytes=50 * _MB,  # 50MB
         backupCount=3,
         encoding='utf-8'
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
-    progress_logger.addHandler(file_handler)
+    _attach_queued(progress_logger, file_handler)
     
     # Prevent propagation to avoid double logging
     progress_logger.propagate = False
@@ -131,20 +197,20 @@ def create_error_logger(log_file: str = "logs/download_errors.log") -> logging.L
     error_logger.handlers.clear()
     
     # Create formatter for error logs
-    formatter = logging.Formatter(
+    formatter = CachedTimeFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
     )
     
     # File handler for errors
     file_handler = logging.handlers.RotatingFileHandler(
         log_file,
-        maxBytes=100 * 1024 * 1024,  # 100MB
+        maxBytes=100 * _MB,  # 100MB
         backupCount=5,
         encoding='utf-8'
     )
     file_handler.setLevel(logging.WARNING)
     file_handler.setFormatter(formatter)
-    error_logger.addHandler(file_handler)
+    _attach_queued(error_logger, file_handler)
     
     # Prevent propagation to avoid double logging
     error_logger.propagate = False
@@ -169,13 +235,13 @@ def log_system_info(logger: logging.Logger):
     
     # Memory information
     memory = psutil.virtual_memory()
-    logger.info(f"Total Memory: {memory.total / (1024**3):.2f} GB")
-    logger.info(f"Available Memory: {memory.available / (1024**3):.2f} GB")
+    logger.info(f"Total Memory: {memory.total / _GB:.2f} GB")
+    logger.info(f"Available Memory: {memory.available / _GB:.2f} GB")
     
     # Disk information for current directory
     disk = psutil.disk_usage('.')
-    logger.info(f"Disk Total: {disk.total / (1024**3):.2f} GB")
-    logger.info(f"Disk Free: {disk.free / (1024**3):.2f} GB")
+    logger.info(f"Disk Total: {disk.total / _GB:.2f} GB")
+    logger.info(f"Disk Free: {disk.free / _GB:.2f} GB")
     
     logger.info("="*60)
 
@@ -199,35 +265,40 @@ class ProgressLogHandler:
     
     def __init__(self, logger: logging.Logger):
         self.logger = logger
-        self.last_log_time = 0
-        self.log_interval = 60  # Log progress every 60 seconds
+        self.log_interval_ns = 60 * 10**9  # Log progress every 60 seconds
+        self.last_log_ns = -self.log_interval_ns  # First message always logs
     
     def log_progress(self, message: str, force: bool = False):
         """Log progress message with time-based throttling."""
-        import time
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         
-        current_time = time.time()
-        if force or (current_time - self.last_log_time) >= self.log_interval:
+        # Monotonic integer clock: immune to wall-clock jumps, no float math
+        now = time.monotonic_ns()
+        if force or now - self.last_log_ns >= self.log_interval_ns:
             self.logger.info(message)
-            self.last_log_time = current_time
+            self.last_log_ns = now
     
     def log_file_completed(self, remote_path: str, file_size: int, duration: float):
         """Log completed file download."""
-        size_mb = file_size / (1024 * 1024)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        size_mb = file_size / _MB
         speed_mbps = size_mb / duration if duration > 0 else 0
         
         self.logger.info(
-            f"COMPLETED: {remote_path} ({size_mb:.2f} MB) "
-            f"in {duration:.2f}s ({speed_mbps:.2f} MB/s)"
+            "COMPLETED: %s (%.2f MB) in %.2fs (%.2f MB/s)",
+            remote_path, size_mb, duration, speed_mbps
         )
     
     def log_file_failed(self, remote_path: str, error: str):
         """Log failed file download."""
-        self.logger.error(f"FAILED: {remote_path} - {error}")
+        self.logger.error("FAILED: %s - %s", remote_path, error)
     
     def log_directory_started(self, remote_dir: str, file_count: int, total_size: int):
         """Log directory download start."""
-        size_gb = total_size / (1024**3)
+        size_gb = total_size / _GB
         self.logger.info(
             f"DIRECTORY_START: {remote_dir} "
             f"({file_count:,} files, {size_gb:.2f} GB)"
@@ -244,8 +315,6 @@ class ProgressLogHandler:
 
 def cleanup_old_logs(log_directory: str = "logs", max_age_days: int = 30):
     """Clean up old log files."""
-    import time
-    
     if not os.path.exists(log_directory):
         return
     
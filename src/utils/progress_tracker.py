@@ -2,17 +2,70 @@
 Progress tracking utilities for resumable PubChem downloads.
 """
 
+import base64
+import itertools
 import json
 import os
+import sys
 import time
 import logging
 import threading
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, asdict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, fields
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+try:
+    from pyroaring import BitMap
+except ImportError:
+    BitMap = None
+
+_GB = 1 << 30  # bytes per GiB
+
+
+# Gathered writes and data-only syncs where the platform has them
+_writev = getattr(os, 'writev', None)
+_datasync = getattr(os, 'fdatasync', os.fsync)
+
+
+def _fsync_directory(path: str):
+    """Make a rename inside path durable, where directories can be opened and synced."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    except OSError:
+        return  # e.g. Windows, which cannot open a directory
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _dumps(data) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FileProgress:
     """Track progress for individual file downloads."""
     remote_path: str
@@ -25,9 +78,10 @@ class FileProgress:
     end_time: Optional[float] = None
     error_message: Optional[str] = None
     retry_count: int = 0
+    validated: bool = False  # gzip stream checked during download
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DirectoryProgress:
     """Track progress for directory downloads."""
     remote_path: str
@@ -43,43 +97,292 @@ class DirectoryProgress:
     status: str = "pending"  # pending, in_progress, completed, failed
 
 
+_FILE_FIELDS = tuple(field.name for field in fields(FileProgress))
+_DIRECTORY_FIELDS = tuple(field.name for field in fields(DirectoryProgress))
+
+
+def _to_dict(progress, names) -> dict:
+    """Shallow field dict for serialization; unlike asdict it does not deep-copy."""
+    return {name: getattr(progress, name) for name in names}
+
+
+# PubChem RDF shard extensions, e.g. .../pc_compound_000123.ttl.gz
+SHARD_EXTENSIONS = ('ttl.gz', 'ttl')
+SHARD_SUFFIXES = tuple('.' + extension for extension in SHARD_EXTENSIONS)
+
+
+class _PagedBitmap:
+    """
+    Pure-Python integer bitmap used when pyroaring is not installed.
+    
+    Bits live in fixed-size bytearray pages keyed by page number, so a
+    dense run of shard numbers costs about one bit each and a stray large
+    number only allocates its own page.
+    """
+    
+    PAGE_BITS = 1 << 16
+    
+    __slots__ = ('_pages', '_count')
+    
+    def __init__(self, numbers: Iterable[int] = ()):
+        self._pages: Dict[int, bytearray] = {}
+        self._count = 0
+        self.update(numbers)
+    
+    def add(self, number: int):
+        page_number, bit = divmod(number, self.PAGE_BITS)
+        page = self._pages.get(page_number)
+        if page is None:
+            page = self._pages.setdefault(page_number, bytearray(self.PAGE_BITS // 8))
+        mask = 1 << (bit & 7)
+        if not page[bit >> 3] & mask:
+            page[bit >> 3] |= mask
+            self._count += 1
+    
+    def update(self, numbers: Iterable[int]):
+        for number in numbers:
+            self.add(number)
+    
+    def discard(self, number: int):
+        page_number, bit = divmod(number, self.PAGE_BITS)
+        page = self._pages.get(page_number)
+        mask = 1 << (bit & 7)
+        if page is not None and page[bit >> 3] & mask:
+            page[bit >> 3] &= ~mask
+            self._count -= 1
+    
+    def __contains__(self, number: int) -> bool:
+        page_number, bit = divmod(number, self.PAGE_BITS)
+        page = self._pages.get(page_number)
+        return page is not None and bool(page[bit >> 3] & (1 << (bit & 7)))
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[int]:
+        for page_number in sorted(self._pages):
+            base = page_number * self.PAGE_BITS
+            for index, byte in enumerate(bytes(self._pages.get(page_number, b''))):
+                while byte:
+                    low = byte & -byte
+                    yield base + index * 8 + low.bit_length() - 1
+                    byte ^= low
+    
+    def copy(self) -> '_PagedBitmap':
+        bitmap = _PagedBitmap()
+        bitmap._pages = {page_number: page[:] for page_number, page in list(self._pages.items())}
+        bitmap._count = self._count
+        return bitmap
+
+
+class CompactPathSet:
+    """
+    Set of remote paths that stores PubChem shard names as integers.
+    
+    Shard paths differing only in their sequence number share a (prefix,
+    width, suffix) template whose numbers go into one roaring bitmap (or a
+    _PagedBitmap without pyroaring); only other paths are kept as strings.
+    Paths are split with a suffix check and str.rpartition rather than a
+    regex, so a membership test stays well under a microsecond. Single
+    add/discard/contains calls are atomic under the GIL, like set.
+    """
+    
+    def __init__(self, paths: Iterable[str] = ()):
+        self._numbered: Dict[Tuple[str, int, str], object] = {}
+        self._other = set()
+        for path in paths:
+            self.add(path)
+    
+    @staticmethod
+    def _split(path: str) -> Optional[Tuple[Tuple[str, int, str], int]]:
+        if not path.endswith(SHARD_SUFFIXES):
+            return None
+        head, sep, name = path.rpartition('_')
+        digits, dot, extension = name.partition('.')
+        if (not sep or not 0 < len(digits) <= 9 or not digits.isdigit()
+                or not digits.isascii() or extension not in SHARD_EXTENSIONS):
+            return None  # Not a shard, or its number would not fit a 32-bit bitmap
+        return (head + sep, len(digits), dot + extension), int(digits)
+    
+    def _numbers(self, template: Tuple[str, int, str]):
+        numbers = self._numbered.get(template)
+        if numbers is None:
+            numbers = self._numbered.setdefault(template, BitMap() if BitMap is not None else _PagedBitmap())
+        return numbers
+    
+    def add(self, path: str):
+        split = self._split(path)
+        if split is None:
+            self._other.add(path)
+        else:
+            self._numbers(split[0]).add(split[1])
+    
+    def discard(self, path: str):
+        split = self._split(path)
+        if split is None:
+            self._other.discard(path)
+            return
+        numbers = self._numbered.get(split[0])
+        if numbers is not None:
+            numbers.discard(split[1])
+    
+    def __contains__(self, path: str) -> bool:
+        split = self._split(path)
+        if split is None:
+            return path in self._other
+        numbers = self._numbered.get(split[0])
+        return numbers is not None and split[1] in numbers
+    
+    def __len__(self) -> int:
+        return len(self._other) + sum(len(numbers) for numbers in list(self._numbered.values()))
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._other)
+        for (prefix, width, suffix), numbers in list(self._numbered.items()):
+            for number in list(numbers):
+                yield f"{prefix}{number:0{width}d}{suffix}"
+    
+    def copy(self) -> 'CompactPathSet':
+        """Return an independent copy, duplicating bitmaps rather than expanding them."""
+        path_set = CompactPathSet()
+        path_set._other = self._other.copy()
+        path_set._numbered = {template: numbers.copy() for template, numbers in list(self._numbered.items())}
+        return path_set
+    
+    def to_json(self) -> dict:
+        """
+        Return the snapshot form: other paths plus one entry per shard template.
+        
+        Returns:
+            Dict with 'paths' and 'shards'; each shard entry is
+            [prefix, width, suffix, encoding, numbers] where numbers is a
+            base64 roaring bitmap ('roaring') or, without pyroaring, a flat
+            list of [start, stop) run bounds ('ranges')
+        """
+        shards = []
+        for (prefix, width, suffix), numbers in list(self._numbered.items()):
+            if not numbers:
+                continue
+            if BitMap is not None:
+                encoded = base64.b64encode(numbers.serialize()).decode('ascii')
+                shards.append([prefix, width, suffix, 'roaring', encoded])
+            else:
+                shards.append([prefix, width, suffix, 'ranges', self._runs(numbers)])
+        return {'paths': list(self._other), 'shards': shards}
+    
+    @staticmethod
+    def _runs(numbers: Iterable[int]) -> List[int]:
+        """Flatten sorted numbers into [start, stop) bounds of consecutive runs."""
+        bounds: List[int] = []
+        for number in numbers:
+            if bounds and bounds[-1] == number:
+                bounds[-1] = number + 1
+            else:
+                bounds += (number, number + 1)
+        return bounds
+    
+    @classmethod
+    def from_json(cls, data) -> 'CompactPathSet':
+        """
+        Rebuild a set from to_json() output or a plain list of paths.
+        
+        Args:
+            data: Snapshot value; older snapshots store a list of paths
+            
+        Returns:
+            The populated CompactPathSet
+        """
+        if isinstance(data, list):
+            return cls(data)
+        
+        path_set = cls(data.get('paths', []))
+        for prefix, width, suffix, encoding, encoded in data.get('shards', []):
+            if encoding == 'roaring':
+                if BitMap is None:
+                    raise ValueError("pyroaring is required to load this progress file")
+                numbers = BitMap.deserialize(base64.b64decode(encoded))
+            else:
+                numbers = itertools.chain.from_iterable(
+                    range(start, stop) for start, stop in zip(encoded[::2], encoded[1::2])
+                )
+            template = (prefix, width, suffix)
+            path_set._numbers(template).update(numbers)
+        return path_set
+
+
+LOCK_STRIPES = 64  # power of two, see ProgressTracker._lock_for
+
+
 class ProgressTracker:
     """Thread-safe progress tracker for resumable downloads."""
     
     def __init__(self, progress_file: str = "data/download_progress.json", 
-                 save_interval: int = 10):
+                 save_interval: int = 10, compact_interval: float = 300.0,
+                 flush_interval: float = 1.0):
         """
         Initialize progress tracker.
         
+        Progress is persisted as a snapshot plus an append-only log of file
+        and directory state changes; the log is replayed on load and folded
+        into a new snapshot at most every compact_interval seconds. Both are
+        written by a background flusher thread so workers never wait on
+        disk I/O.
+        
         Args:
             progress_file: Path to save progress data
-            save_interval: Save progress every N file updates
+            save_interval: Append logged file updates every N updates
+            compact_interval: Minimum seconds between snapshot rewrites
+            flush_interval: Seconds between flusher wake-ups for partial batches
         """
         self.progress_file = progress_file
         self.save_interval = save_interval
+        self.compact_interval = compact_interval
+        self.wal_file = os.path.splitext(progress_file)[0] + '.wal'
+        self._wal_fd: Optional[int] = None
+        self._wal_buffer: List[bytes] = []
+        self.flush_interval = flush_interval
+        self.last_compaction = time.time()
+        # The global lock guards directories, counters and the log buffer;
+        # per-file state is guarded by a stripe chosen by path so workers
+        # rarely collide. The log lock serializes log file I/O and is always
+        # taken before the others.
         self.lock = threading.Lock()
+        self._wal_lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
         self.logger = logging.getLogger(__name__)
         
         # Progress data
         self.directories: Dict[str, DirectoryProgress] = {}
         self.files: Dict[str, FileProgress] = {}
-        self.completed_files: Set[str] = set()
-        self.failed_files: Set[str] = set()
+        self.completed_files = CompactPathSet()
+        self.failed_files = CompactPathSet()
         
         # Counters
         self.total_files_processed = 0
         self.files_since_last_save = 0
         self.session_start_time = time.time()
         
+        # Running byte and in-progress totals, one slot per lock stripe so
+        # each is updated under the stripe lock that guards its files
+        self._total_bytes = [0] * LOCK_STRIPES
+        self._downloaded_bytes = [0] * LOCK_STRIPES
+        self._in_progress = [0] * LOCK_STRIPES
+        
         # Load existing progress
         self.load_progress()
+        
+        # Background flusher, woken early when a batch fills up
+        self._dirty = threading.Event()
+        self._stop_flusher = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="progress-flusher", daemon=True)
+        self._flusher.start()
     
     def load_progress(self):
         """Load progress from file if it exists."""
         try:
             if os.path.exists(self.progress_file):
-                with open(self.progress_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.progress_file, 'rb') as f:
+                    data = _loads(f.read())
                 
                 # Load directories
                 for dir_path, dir_data in data.get('directories', {}).items():
@@ -90,24 +393,143 @@ class ProgressTracker:
                     self.files[file_path] = FileProgress(**file_data)
                 
                 # Load completed and failed files sets
-                self.completed_files = set(data.get('completed_files', []))
-                self.failed_files = set(data.get('failed_files', []))
+                self.completed_files = CompactPathSet.from_json(data.get('completed_files', []))
+                self.failed_files = CompactPathSet.from_json(data.get('failed_files', []))
                 
-                self.logger.info(f"Loaded progress: {len(self.completed_files)} completed, "
-                               f"{len(self.failed_files)} failed files")
             else:
                 self.logger.info("No existing progress file found, starting fresh")
+            
+            replayed = self._replay_wal()
+            self._recount()
+            if os.path.exists(self.progress_file) or replayed:
+                self.logger.info(f"Loaded progress: {len(self.completed_files)} completed, "
+                               f"{len(self.failed_files)} failed files "
+                               f"({replayed} logged updates replayed)")
                 
         except Exception as e:
             self.logger.error(f"Failed to load progress file: {e}")
             self.logger.info("Starting with empty progress")
     
-    def save_progress(self, force: bool = False):
-        """Save progress to file."""
-        with self.lock:
-            if not force and self.files_since_last_save < self.save_interval:
+    def _replay_wal(self) -> int:
+        """Apply logged file and directory updates on top of the loaded snapshot."""
+        if not os.path.exists(self.wal_file):
+            return 0
+        
+        replayed = 0
+        with open(self.wal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    # A crash can leave the last line partially written
+                    self.logger.warning(f"Skipping unreadable progress log entry in {self.wal_file}")
+                    continue
+                
+                directory = record.get('directory')
+                if directory is not None:
+                    self.directories[directory['remote_path']] = DirectoryProgress(**directory)
+                    replayed += 1
+                    continue
+                
+                file_progress = FileProgress(**record)
+                self.files[file_progress.remote_path] = file_progress
+                if file_progress.status == "completed":
+                    self.completed_files.add(file_progress.remote_path)
+                    self.failed_files.discard(file_progress.remote_path)
+                elif file_progress.status == "failed":
+                    self.failed_files.add(file_progress.remote_path)
+                replayed += 1
+        return replayed
+    
+    def _recount(self):
+        """Rebuild the running totals from self.files after loading."""
+        for stripe in range(LOCK_STRIPES):
+            self._total_bytes[stripe] = 0
+            self._downloaded_bytes[stripe] = 0
+            self._in_progress[stripe] = 0
+        for remote_path, file_progress in self.files.items():
+            stripe = self._stripe(remote_path)
+            self._total_bytes[stripe] += file_progress.size_bytes or 0
+            self._downloaded_bytes[stripe] += file_progress.downloaded_bytes
+            self._in_progress[stripe] += file_progress.status == "downloading"
+    
+    def _stripe(self, remote_path: str) -> int:
+        """Return the lock stripe index for a file."""
+        return hash(remote_path) & (LOCK_STRIPES - 1)
+    
+    def _lock_for(self, remote_path: str) -> threading.Lock:
+        """Return the stripe lock guarding a file's progress entry."""
+        return self._locks[self._stripe(remote_path)]
+    
+    @contextmanager
+    def _lock_all(self):
+        """Hold the global lock and every stripe, for a consistent view of all files."""
+        with self.lock, ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            yield
+    
+    def _log_record(self, record: bytes):
+        """Queue a serialized file or directory state for the append-only log (global lock must be held)."""
+        self._wal_buffer.append(record)
+        if len(self._wal_buffer) >= self.save_interval:
+            self._dirty.set()
+    
+    def _flush_loop(self):
+        """Flusher thread: sync the log every flush_interval or when woken, compacting when due."""
+        while not self._stop_flusher:
+            self._dirty.wait(self.flush_interval)
+            self._dirty.clear()
+            if not self._stop_flusher:
+                self.save_progress()
+    
+    def _flush_wal(self):
+        """
+        Append queued records to the log and make them durable.
+        
+        The whole batch goes out in one gathered write followed by a single
+        fdatasync, so the sync cost is shared by every record in it. Only the
+        log lock is held during the I/O, so workers can keep queueing.
+        """
+        with self._wal_lock:
+            with self.lock:
+                batch = self._wal_buffer
+                self._wal_buffer = []
+            if not batch:
                 return
             
+            try:
+                if self._wal_fd is None:
+                    Path(self.wal_file).parent.mkdir(parents=True, exist_ok=True)
+                    self._wal_fd = os.open(self.wal_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                
+                written = _writev(self._wal_fd, batch) if _writev is not None else 0
+                if written < sum(map(len, batch)):
+                    remaining = b''.join(batch)[written:]
+                else:
+                    remaining = b''
+                while remaining:
+                    remaining = remaining[os.write(self._wal_fd, remaining):]
+                _datasync(self._wal_fd)
+            except OSError as e:
+                self.logger.error(f"Failed to append to progress log: {e}")
+                # Keep the records for the next attempt, ahead of newer ones
+                with self.lock:
+                    self._wal_buffer[:0] = batch
+    
+    def save_progress(self, force: bool = False):
+        """
+        Persist progress.
+        
+        Queued log records are always flushed; the full snapshot is only
+        rewritten (compacting the log) when forced or compact_interval has
+        elapsed.
+        """
+        if not force and time.time() - self.last_compaction < self.compact_interval:
+            self._flush_wal()
+            return
+        
+        with self._wal_lock, self._lock_all():
             try:
                 # Ensure directory exists
                 Path(self.progress_file).parent.mkdir(parents=True, exist_ok=True)
@@ -115,13 +537,13 @@ class ProgressTracker:
                 # Prepare data for serialization
                 data = {
                     'directories': {
-                        path: asdict(progress) for path, progress in self.directories.items()
+                        path: _to_dict(progress, _DIRECTORY_FIELDS) for path, progress in self.directories.items()
                     },
                     'files': {
-                        path: asdict(progress) for path, progress in self.files.items()
+                        path: _to_dict(progress, _FILE_FIELDS) for path, progress in self.files.items()
                     },
-                    'completed_files': list(self.completed_files),
-                    'failed_files': list(self.failed_files),
+                    'completed_files': self.completed_files.to_json(),
+                    'failed_files': self.failed_files.to_json(),
                     'session_start_time': self.session_start_time,
                     'last_save_time': time.time(),
                     'total_files_processed': self.total_files_processed
@@ -129,14 +551,25 @@ class ProgressTracker:
                 
                 # Write to temporary file first
                 temp_file = self.progress_file + '.tmp'
-                with open(temp_file, 'w') as f:
-                    json.dump(data, f, indent=2)
+                with open(temp_file, 'wb') as f:
+                    f.write(_dumps(data))
+                    f.flush()
+                    os.fsync(f.fileno())
                 
-                # Atomic move
+                # Atomic move, made durable before the log it replaces is dropped
                 os.replace(temp_file, self.progress_file)
+                _fsync_directory(os.path.dirname(os.path.abspath(self.progress_file)))
                 
+                # The snapshot now covers everything logged so far
+                self._wal_buffer.clear()
+                if self._wal_fd is not None:
+                    os.ftruncate(self._wal_fd, 0)
+                elif os.path.exists(self.wal_file):
+                    os.remove(self.wal_file)
+                
+                self.last_compaction = time.time()
                 self.files_since_last_save = 0
-                self.logger.debug(f"Progress saved to {self.progress_file}")
+                self.logger.debug("Progress saved to %s", self.progress_file)
                 
             except Exception as e:
                 self.logger.error(f"Failed to save progress: {e}")
@@ -154,53 +587,89 @@ class ProgressTracker:
                     start_time=time.time(),
                     status="in_progress"
                 )
-                self.logger.debug(f"Added directory to track: {remote_path}")
+                self._log_directory(self.directories[remote_path])
+                self.logger.debug("Added directory to track: %s", remote_path)
+    
+    def set_directory_totals(self, remote_path: str, total_files: int, total_bytes: int):
+        """Record a directory's totals once its streamed listing is complete."""
+        with self.lock:
+            if remote_path in self.directories:
+                self.directories[remote_path].total_files = total_files
+                self.directories[remote_path].total_bytes = total_bytes
+                self._log_directory(self.directories[remote_path])
+    
+    def _log_directory(self, directory: DirectoryProgress):
+        """Log a directory's state, tagged so replay can tell it from file records (global lock must be held)."""
+        self._log_record(_dumps({'directory': _to_dict(directory, _DIRECTORY_FIELDS)}) + b'\n')
     
     def add_file(self, remote_path: str, local_path: str, 
                  size_bytes: Optional[int] = None):
         """Add a file to track."""
-        with self.lock:
+        # Entries are never removed, so a hit needs no lock
+        if remote_path in self.files:
+            return
+        
+        stripe = self._stripe(remote_path)
+        with self._locks[stripe]:
             if remote_path not in self.files:
+                self._total_bytes[stripe] += size_bytes or 0
                 self.files[remote_path] = FileProgress(
                     remote_path=remote_path,
                     local_path=local_path,
                     size_bytes=size_bytes,
                     start_time=time.time()
                 )
-                self.logger.debug(f"Added file to track: {remote_path}")
+                self.logger.debug("Added file to track: %s", remote_path)
     
     def is_file_completed(self, remote_path: str) -> bool:
         """Check if a file is already completed."""
-        with self.lock:
-            if remote_path in self.completed_files:
+        # Completion is never revoked and set membership is atomic, so the
+        # common hit is answered without taking a lock
+        if remote_path in self.completed_files:
+            return True
+        
+        with self._lock_for(remote_path):
+            file_progress = self.files.get(remote_path)
+            if file_progress is not None and file_progress.status == "completed":
+                self.completed_files.add(remote_path)
                 return True
             
-            if remote_path in self.files:
-                file_progress = self.files[remote_path]
+            return False
+    
+    def snapshot_completed(self) -> CompactPathSet:
+        """
+        Return a private snapshot of all completed file paths.
+        
+        Callers filtering many paths at once can test membership against
+        the snapshot without taking the tracker lock per file. It is a
+        compact copy, so shard paths are not expanded into strings.
+        """
+        with self._lock_all():
+            for remote_path, file_progress in self.files.items():
                 if file_progress.status == "completed":
                     self.completed_files.add(remote_path)
-                    return True
-            
-            return False
+            return self.completed_files.copy()
     
     def is_file_failed(self, remote_path: str) -> bool:
         """Check if a file has failed and should be retried."""
-        with self.lock:
+        with self._lock_for(remote_path):
             return remote_path in self.failed_files
     
     def update_file_progress(self, remote_path: str, downloaded_bytes: int, 
                            status: str = "downloading"):
         """Update file download progress."""
-        with self.lock:
-            if remote_path in self.files:
-                file_progress = self.files[remote_path]
+        record = None
+        stripe = self._stripe(remote_path)
+        with self._locks[stripe]:
+            file_progress = self.files.get(remote_path)
+            if file_progress is not None:
+                self._downloaded_bytes[stripe] += downloaded_bytes - file_progress.downloaded_bytes
+                self._in_progress[stripe] += (status == "downloading") - (file_progress.status == "downloading")
                 file_progress.downloaded_bytes = downloaded_bytes
                 file_progress.status = status
                 
                 if status in ["completed", "failed", "skipped"]:
                     file_progress.end_time = time.time()
-                    self.total_files_processed += 1
-                    self.files_since_last_save += 1
                     
                     if status == "completed":
                         self.completed_files.add(remote_path)
@@ -208,24 +677,49 @@ class ProgressTracker:
                     elif status == "failed":
                         self.failed_files.add(remote_path)
                         file_progress.retry_count += 1
+                    
+                    record = _dumps(_to_dict(file_progress, _FILE_FIELDS)) + b'\n'
+        
+        # Stripe and global locks are never held together outside
+        # _lock_all, so the log append happens after the stripe is released
+        if record is not None:
+            with self.lock:
+                self.total_files_processed += 1
+                self.files_since_last_save += 1
+                self._log_record(record)
+    
+    def mark_file_validated(self, remote_path: str):
+        """Record that a file's contents were validated."""
+        with self._lock_for(remote_path):
+            if remote_path in self.files:
+                self.files[remote_path].validated = True
     
     def set_file_error(self, remote_path: str, error_message: str):
         """Set error message for a file."""
-        with self.lock:
+        record = None
+        stripe = self._stripe(remote_path)
+        with self._locks[stripe]:
             if remote_path in self.files:
+                self._in_progress[stripe] -= self.files[remote_path].status == "downloading"
                 self.files[remote_path].error_message = error_message
                 self.files[remote_path].status = "failed"
                 self.files[remote_path].end_time = time.time()
                 self.failed_files.add(remote_path)
+                record = _dumps(_to_dict(self.files[remote_path], _FILE_FIELDS)) + b'\n'
+        
+        if record is not None:
+            with self.lock:
+                self._log_record(record)
     
     def get_files_to_download(self, directory_files: List[str]) -> List[str]:
-        """Get list of files that still need to be downloaded."""
-        with self.lock:
-            return [f for f in directory_files if not self.is_file_completed(f)]
+        """Get list of files that still need to be downloaded, in their given order."""
+        # One snapshot instead of a lock round-trip per file
+        completed = self.snapshot_completed()
+        return [f for f in directory_files if f not in completed]
     
     def get_failed_files(self, max_retries: int = 3) -> List[str]:
         """Get list of failed files that should be retried."""
-        with self.lock:
+        with self._lock_all():
             failed_to_retry = []
             for remote_path in self.failed_files:
                 if remote_path in self.files:
@@ -236,15 +730,15 @@ class ProgressTracker:
     
     def get_statistics(self) -> dict:
         """Get download statistics."""
+        # Reads the running totals, so workers are not blocked
         with self.lock:
             total_files = len(self.files)
             completed_files = len(self.completed_files)
             failed_files = len(self.failed_files)
-            in_progress_files = sum(1 for f in self.files.values() 
-                                  if f.status == "downloading")
+            in_progress_files = sum(self._in_progress)
             
-            total_bytes = sum(f.size_bytes or 0 for f in self.files.values())
-            downloaded_bytes = sum(f.downloaded_bytes for f in self.files.values())
+            total_bytes = sum(self._total_bytes)
+            downloaded_bytes = sum(self._downloaded_bytes)
             
             session_duration = time.time() - self.session_start_time
             
@@ -277,8 +771,8 @@ class ProgressTracker:
         
         if stats['total_bytes'] > 0:
             print(f"\nData Transfer:")
-            print(f"Total Size: {stats['total_bytes'] / (1024**3):.2f} GB")
-            print(f"Downloaded: {stats['downloaded_bytes'] / (1024**3):.2f} GB ({stats['download_rate']:.1%})")
+            print(f"Total Size: {stats['total_bytes'] / _GB:.2f} GB")
+            print(f"Downloaded: {stats['downloaded_bytes'] / _GB:.2f} GB ({stats['download_rate']:.1%})")
         
         print(f"\nSession Duration: {stats['session_duration'] / 3600:.2f} hours")
         print(f"Processing Rate: {stats['files_per_second']:.2f} files/second")
@@ -286,5 +780,13 @@ class ProgressTracker:
     
     def cleanup(self):
         """Clean up and save final progress."""
+        self._stop_flusher = True
+        self._dirty.set()
+        self._flusher.join()
+        
         self.save_progress(force=True)
+        with self._wal_lock:
+            if self._wal_fd is not None:
+                os.close(self._wal_fd)
+                self._wal_fd = None
         self.logger.info("Progress tracker cleanup completed") 
\ No newline at end of file
@@ -3,86 +3,464 @@ Rate limiting utilities for PubChem FTP downloads.
 """
 
 import time
+import array
+import asyncio
+import bisect
+import random
+import itertools
 import threading
 import logging
-from typing import Optional
-from collections import deque
+from typing import Optional, Tuple
+
+# Sleeps this short cost more in syscall and timer slack than they enforce;
+# they are skipped, but accounted for as if they had happened
+SLEEP_EPSILON = 1e-3
+
+# Last timestamp published by refresh_now(), for loops that share one clock read
+_cached_now = 0.0
+
+
+def refresh_now() -> float:
+    """
+    Read the monotonic clock once and publish it for this loop iteration.
+    
+    Returns:
+        The new timestamp, suitable for passing to RateLimiter.wait(now=...)
+    """
+    global _cached_now
+    _cached_now = time.monotonic()
+    return _cached_now
+
+
+def cached_now() -> float:
+    """Return the timestamp from the last refresh_now() call, refreshing if none yet."""
+    return _cached_now or refresh_now()
 
 
 class RateLimiter:
     """Thread-safe rate limiter for controlling download request frequency."""
     
-    def __init__(self, delay_seconds: float = 2.0, max_requests_per_minute: Optional[int] = None):
+    RPM_ALGORITHMS = ('token_bucket', 'sliding_window', 'sliding_log')
+    WINDOW_SECONDS = 60.0
+    
+    def __init__(self, delay_seconds: float = 2.0, max_requests_per_minute: Optional[int] = None,
+                 rpm_algorithm: str = "token_bucket"):
         """
         Initialize rate limiter.
         
         Args:
             delay_seconds: Minimum delay between requests
             max_requests_per_minute: Maximum requests per minute (optional)
+            rpm_algorithm: How max_requests_per_minute is enforced:
+                "token_bucket" allows a minute's quota as a burst and then
+                paces at the refill rate; "sliding_window" estimates the
+                trailing minute from the current and previous minute counts;
+                "sliding_log" keeps every timestamp of the trailing minute
+                and enforces the cap exactly
         """
+        if rpm_algorithm not in self.RPM_ALGORITHMS:
+            raise ValueError(f"rpm_algorithm must be one of {', '.join(self.RPM_ALGORITHMS)}")
+        if max_requests_per_minute and max_requests_per_minute < 1:
+            # A bucket or log smaller than one request could never grant one
+            raise ValueError("max_requests_per_minute must be at least 1")
         self.delay_seconds = delay_seconds
+        self.rpm_algorithm = rpm_algorithm
         self.max_requests_per_minute = max_requests_per_minute
-        self.last_request_time = 0.0
-        self.request_times = deque()
-        self.lock = threading.Lock()
+        # Monotonic clock throughout, so wall-clock jumps cannot skew limits;
+        # starting one delay in the past lets the first request go at once
+        self.last_request_time = time.monotonic() - delay_seconds
+        
+        # Token bucket for max_requests_per_minute: holds up to one minute's
+        # worth of requests and refills continuously, O(1) per request
+        self.tokens = float(max_requests_per_minute or 0)
+        self.refill_rate = (max_requests_per_minute or 0) / 60.0
+        self.last_refill = self.last_request_time
+        
+        # Sliding-window counter: request counts for the current and previous
+        # fixed minute, weighted by how much of the previous one still overlaps
+        self._window_start = self._window_floor(self.last_request_time)
+        self._current_count = 0
+        self._previous_count = 0
+        
+        # Sliding log: a ring buffer of C doubles holding the timestamps of
+        # the trailing minute, 8 bytes per request and no per-entry objects
+        log_capacity = max(1, int(max_requests_per_minute)) \
+            if max_requests_per_minute and rpm_algorithm == "sliding_log" else 0
+        self.request_times = array.array('d', bytes(8 * log_capacity))
+        self._log_head = 0
+        self._log_count = 0
+        
+        # Choose the quota steps once instead of branching on every call;
+        # without a quota the no-op steps stand in, so callers never test.
+        # Plain functions, called with self, so the instance holds no
+        # bound methods of its own (a reference cycle)
+        cls = type(self)
+        if not max_requests_per_minute:
+            quota_steps = (cls._no_quota_sleep, cls._no_take_slot, cls._no_quota_requests)
+        elif rpm_algorithm == "sliding_window":
+            quota_steps = (cls._window_sleep, cls._take_window_slot, cls._window_requests)
+        elif rpm_algorithm == "sliding_log":
+            quota_steps = (cls._log_sleep, cls._take_log_slot, cls._log_requests)
+        else:
+            quota_steps = (cls._token_sleep, cls._take_token, cls._token_requests)
+        self._quota_sleep, self._take_slot, self._quota_requests = quota_steps
+        
+        # Each waiter reserves its slot under the lock, then sleeps on the
+        # condition, releasing it: waiters sleep concurrently on staggered
+        # slots, nobody queues behind a sleeper, and shutdown() can wake them.
+        # wait() enters the underlying C lock directly: Condition.__enter__
+        # is a Python-level call and costs more than the rest of a no-sleep wait()
+        self._lock = threading.Lock()
+        self._cv = threading.Condition(self._lock)
+        self._closed = False
         self.logger = logging.getLogger(__name__)
         
-    def wait(self):
-        """Wait if necessary to respect rate limits."""
-        with self.lock:
-            current_time = time.time()
-            
-            # Clean old request times (older than 60 seconds)
-            if self.max_requests_per_minute:
-                while (self.request_times and 
-                       current_time - self.request_times[0] > 60):
-                    self.request_times.popleft()
-                
-                # Check if we've exceeded requests per minute
-                if len(self.request_times) >= self.max_requests_per_minute:
-                    sleep_time = 60 - (current_time - self.request_times[0])
-                    if sleep_time > 0:
-                        self.logger.debug(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
-                        time.sleep(sleep_time)
-                        current_time = time.time()
+        # Partial evaluation: the quota configuration is fixed for the
+        # limiter's lifetime, so pick the matching implementation once. It
+        # is stored as a plain function for the same reason as the quota steps
+        self._wait_impl = cls._acquire_with_quota if max_requests_per_minute else cls._acquire_delay_only
+        
+    def wait(self, now: Optional[float] = None):
+        """
+        Wait if necessary to respect rate limits.
+        
+        Returns at once after shutdown(), waking callers already asleep.
+        
+        Args:
+            now: Monotonic timestamp the caller already read (e.g. from
+                refresh_now()); the clock is read here when omitted
+        """
+        self._wait_impl(self, 1, now)
+    
+    def acquire(self, n: int = 1, now: Optional[float] = None):
+        """
+        Wait once for n permits, as if n requests had been rate limited.
+        
+        Callers about to issue a batch of requests pay one lock round-trip
+        and at most one sleep instead of n: the wait covers n delays since
+        the previous request and n units of the per-minute quota.
+        
+        Args:
+            n: Number of permits to take
+            now: Monotonic timestamp the caller already read; the clock is
+                read here when omitted
+        """
+        if n != 1:
+            if n < 1:
+                raise ValueError("n must be at least 1")
+            if self.max_requests_per_minute and n > self._quota_capacity():
+                raise ValueError(f"n exceeds the per-minute quota of {self._quota_capacity()}")
+        self._wait_impl(self, n, now)
+    
+    def _acquire_with_quota(self, n: int, now: Optional[float]):
+        """Take n permits, enforcing the delay and the per-minute quota."""
+        if now is None:
+            now = time.monotonic()
+        
+        with self._lock:
+            if self._closed:
+                return
             
-            # Enforce minimum delay between requests
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.delay_seconds:
-                sleep_time = self.delay_seconds - time_since_last
-                self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                current_time = time.time()
+            # Reserve the slot before sleeping: later callers schedule after
+            # it instead of waking up to compete for it
+            scheduled = self._schedule(now, n)
+            self._take_slot(self, scheduled, n)
+            self.last_request_time = scheduled
             
-            # Record this request
-            self.last_request_time = current_time
-            if self.max_requests_per_minute:
-                self.request_times.append(current_time)
+            if scheduled - now > SLEEP_EPSILON:
+                self.logger.debug("Rate limiting: waiting for %.2f seconds", scheduled - now)
+                self._sleep_until(scheduled)
     
-    def get_stats(self) -> dict:
-        """Get rate limiter statistics."""
-        with self.lock:
-            current_time = time.time()
+    def _acquire_delay_only(self, n: int, now: Optional[float]):
+        """Take n permits for limiters with no per-minute quota."""
+        if now is None:
+            now = time.monotonic()
+        
+        # Fast path: the delay has clearly passed and nobody holds the
+        # lock, so record the request without taking it. Every read is
+        # a single attribute load, atomic under the GIL; two threads
+        # racing here after an idle spell of twice the delay can both
+        # pass, which costs at most one back-to-back pair of requests
+        if now - self.last_request_time > self.delay_seconds * (n + 1) \
+                and not self._lock.locked() and not self._closed:
+            self.last_request_time = now
+            return
+        
+        with self._lock:
+            if self._closed:
+                return
             
-            # Clean old request times
-            if self.max_requests_per_minute:
-                while (self.request_times and 
-                       current_time - self.request_times[0] > 60):
-                    self.request_times.popleft()
+            scheduled = self.last_request_time + self.delay_seconds * n
+            if scheduled < now:
+                scheduled = now
+            self.last_request_time = scheduled
             
-            return {
-                'delay_seconds': self.delay_seconds,
-                'max_requests_per_minute': self.max_requests_per_minute,
-                'requests_in_last_minute': len(self.request_times) if self.max_requests_per_minute else None,
-                'time_since_last_request': current_time - self.last_request_time
-            }
+            if scheduled - now > SLEEP_EPSILON:
+                self.logger.debug("Rate limiting: waiting for %.2f seconds", scheduled - now)
+                self._sleep_until(scheduled)
+    
+    def _schedule(self, now: float, n: int) -> float:
+        """Earliest time n more requests are allowed, at or after now (lock must be held)."""
+        # A timestamp read before waiting on the lock may predate the
+        # previous request, which may also be reserved in the future;
+        # never schedule before it
+        last_request_time = self.last_request_time
+        current_time = now if now > last_request_time else last_request_time
+        
+        # delay_seconds can be adjusted concurrently (see
+        # AdaptiveRateLimiter), so read it once
+        sleep_time = self.delay_seconds * n - (current_time - last_request_time)
+        quota_time = self._quota_sleep(self, current_time, n)
+        if quota_time > sleep_time:
+            sleep_time = quota_time
+        return current_time + sleep_time if sleep_time > 0 else current_time
+    
+    def _sleep_until(self, deadline: float):
+        """Sleep on the condition until deadline or shutdown() (lock must be held)."""
+        while not self._closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= SLEEP_EPSILON:
+                return
+            self._cv.wait(remaining)
+    
+    def reserve(self, n: int = 1, now: Optional[float] = None) -> float:
+        """
+        Reserve n permits without sleeping.
+        
+        The slot is committed at once, exactly as acquire() would, so the
+        caller only has to sleep until it; callers that cannot block the
+        thread (see AsyncRateLimiter) sleep their own way.
+        
+        Args:
+            n: Number of permits to take
+            now: Monotonic timestamp the caller already read; the clock is
+                read here when omitted
+            
+        Returns:
+            Monotonic time at which the permits are due; now if the
+            limiter is shut down
+        """
+        if n != 1:
+            if n < 1:
+                raise ValueError("n must be at least 1")
+            if self.max_requests_per_minute and n > self._quota_capacity():
+                raise ValueError(f"n exceeds the per-minute quota of {self._quota_capacity()}")
+        if now is None:
+            now = time.monotonic()
+        
+        with self._lock:
+            if self._closed:
+                return now
+            scheduled = self._schedule(now, n)
+            self._take_slot(self, scheduled, n)
+            self.last_request_time = scheduled
+            return scheduled
+    
+    def _quota_capacity(self) -> int:
+        """Most permits the per-minute quota can grant at once."""
+        if self.rpm_algorithm == "sliding_log":
+            return len(self.request_times)
+        return int(self.max_requests_per_minute)
+    
+    def shutdown(self):
+        """Wake all waiters and let every wait() return immediately until resume()."""
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+    
+    def resume(self):
+        """Re-enable rate limiting after shutdown()."""
+        with self._cv:
+            self._closed = False
+    
+    def _no_quota_sleep(self, current_time: float, n: int = 1) -> float:
+        """Quota step for limiters without max_requests_per_minute: never waits."""
+        return 0.0
+    
+    def _no_take_slot(self, current_time: float, n: int = 1):
+        """Quota step for limiters without max_requests_per_minute: records nothing."""
+    
+    def _no_quota_requests(self, now: float) -> None:
+        """Requests in the last minute are not tracked without a quota."""
+        return None
+    
+    def _token_requests(self, now: float) -> int:
+        """Tokens spent and not yet refilled, approximating the last minute's requests."""
+        limit = self.max_requests_per_minute
+        tokens, last_refill = self.tokens, self.last_refill
+        tokens = min(limit, tokens + max(0.0, now - last_refill) * self.refill_rate)
+        return round(limit - tokens)
+    
+    def _token_sleep(self, current_time: float, n: int = 1) -> float:
+        """Seconds until the bucket holds n whole tokens (lock must be held)."""
+        # _refill() inlined: this runs on every wait()
+        tokens = self.tokens
+        elapsed = current_time - self.last_refill
+        if elapsed > 0:
+            tokens = tokens + elapsed * self.refill_rate
+            limit = self.max_requests_per_minute
+            if tokens > limit:
+                tokens = limit
+            self.tokens = tokens
+            self.last_refill = current_time
+        return (n - tokens) / self.refill_rate if tokens < n else 0.0
+    
+    def _take_token(self, current_time: float, n: int = 1):
+        """Spend n tokens (lock must be held)."""
+        if current_time != self.last_refill:
+            self._refill(current_time)
+        self.tokens -= n
+    
+    def _window_floor(self, now: float) -> float:
+        """Start of the fixed window containing now."""
+        return now - now % self.WINDOW_SECONDS
+    
+    def _roll_window(self, now: float):
+        """Advance the window counts to the window containing now (lock must be held)."""
+        if 0 <= now - self._window_start < self.WINDOW_SECONDS:
+            return  # Still in the current window, the common case
+        window_start = self._window_floor(now)
+        if window_start != self._window_start:
+            adjacent = window_start - self._window_start == self.WINDOW_SECONDS
+            self._previous_count = self._current_count if adjacent else 0
+            self._current_count = 0
+            self._window_start = window_start
+    
+    def _window_estimate(self, now: float) -> float:
+        """Estimated requests in the trailing minute (lock must be held)."""
+        overlap = 1 - (now - self._window_start) / self.WINDOW_SECONDS
+        return self._previous_count * overlap + self._current_count
+    
+    def _window_sleep(self, current_time: float, n: int = 1) -> float:
+        """Seconds until the trailing-minute estimate admits n more requests (lock must be held)."""
+        limit = self.max_requests_per_minute
+        self._roll_window(current_time)
+        
+        # Admit the requests only if they still fit once counted
+        window_start = self._window_start
+        overlap = 1 - (current_time - window_start) / self.WINDOW_SECONDS
+        if self._previous_count * overlap + self._current_count + n <= limit:
+            return 0.0
+        if self._current_count + n > limit or not self._previous_count:
+            # This window alone is full. These counts become the previous
+            # window's, so wait until enough of them slide out of it too
+            next_start = window_start + self.WINDOW_SECONDS
+            if not self._current_count:
+                return next_start - current_time
+            overlap_allowed = (limit - n) / self._current_count
+            return next_start + self.WINDOW_SECONDS * (1 - overlap_allowed) - current_time
+        # Wait until enough of the previous window has slid out
+        overlap_allowed = (limit - n - self._current_count) / self._previous_count
+        return self._window_start + self.WINDOW_SECONDS * (1 - overlap_allowed) - current_time
+    
+    def _window_requests(self, now: float) -> int:
+        """Trailing-minute estimate, with the counts projected onto now as _roll_window would."""
+        window_start = self._window_start
+        current_count, previous_count = self._current_count, self._previous_count
+        elapsed_windows = (self._window_floor(now) - window_start) // self.WINDOW_SECONDS
+        if elapsed_windows >= 1:
+            previous_count = current_count if elapsed_windows == 1 else 0
+            current_count = 0
+            window_start += elapsed_windows * self.WINDOW_SECONDS
+        # A slot reserved ahead can start a window after now; count all of the previous one
+        overlap = min(1.0, 1 - (now - window_start) / self.WINDOW_SECONDS)
+        return round(previous_count * overlap + current_count)
+    
+    def _take_window_slot(self, current_time: float, n: int = 1):
+        """Count n requests in the current window (lock must be held)."""
+        self._roll_window(current_time)
+        self._current_count += n
+    
+    @staticmethod
+    def _count_expired(request_times: array.array, head: int, count: int, cutoff: float) -> int:
+        """Number of logged timestamps at or before cutoff, by binary search."""
+        if not count or request_times[head] > cutoff:
+            return 0  # Nothing expired, the common case
+        capacity = len(request_times)
+        end = head + count
+        # The log is sorted, so split the ring into at most two sorted runs
+        if end <= capacity:
+            return bisect.bisect_right(request_times, cutoff, head, end) - head
+        if request_times[capacity - 1] > cutoff:
+            return bisect.bisect_right(request_times, cutoff, head, capacity) - head
+        return capacity - head + bisect.bisect_right(request_times, cutoff, 0, end - capacity)
+    
+    def _evict_log(self, now: float):
+        """Drop timestamps older than the trailing minute (lock must be held)."""
+        request_times = self.request_times
+        expired = self._count_expired(request_times, self._log_head, self._log_count,
+                                      now - self.WINDOW_SECONDS)
+        if expired:
+            self._log_head = (self._log_head + expired) % len(request_times)
+            self._log_count -= expired
+    
+    def _log_requests(self, now: float) -> int:
+        """Live entries in a snapshot of the ring."""
+        head, count = self._log_head, self._log_count
+        return count - self._count_expired(self.request_times, head, count, now - self.WINDOW_SECONDS)
+    
+    def _log_sleep(self, current_time: float, n: int = 1) -> float:
+        """Seconds until the log has room for n more requests (lock must be held)."""
+        self._evict_log(current_time)
+        request_times = self.request_times
+        capacity = len(request_times)
+        excess = self._log_count + n - capacity
+        if excess <= 0:
+            return 0.0
+        # Wait for the excess-th oldest request to leave the trailing minute
+        return request_times[(self._log_head + excess - 1) % capacity] + self.WINDOW_SECONDS - current_time
+    
+    def _take_log_slot(self, current_time: float, n: int = 1):
+        """Log n requests (lock must be held)."""
+        self._evict_log(current_time)
+        request_times = self.request_times
+        capacity = len(request_times)
+        head, count = self._log_head, self._log_count
+        for _ in range(n):
+            if count == capacity:
+                # Only reachable through the sub-epsilon skip: overwrite the oldest
+                head = (head + 1) % capacity
+                count -= 1
+            request_times[(head + count) % capacity] = current_time
+            count += 1
+        self._log_head, self._log_count = head, count
+    
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last refill (lock must be held)."""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.max_requests_per_minute, self.tokens + elapsed * self.refill_rate)
+            self.last_refill = now
+    
+    def get_stats(self) -> dict:
+        """
+        Get rate limiter statistics.
+        
+        Lock-free: each field is a single attribute read, atomic under the
+        GIL, and the quota state is projected to now without being written
+        back, so monitoring never contends with wait(). Values may be
+        stale by one in-flight request.
+        """
+        current_time = time.monotonic()
+        requests_in_last_minute = self._quota_requests(self, current_time)
+        
+        return {
+            'delay_seconds': self.delay_seconds,
+            'max_requests_per_minute': self.max_requests_per_minute,
+            'requests_in_last_minute': requests_in_last_minute,
+            'time_since_last_request': current_time - self.last_request_time
+        }
 
 
 class AdaptiveRateLimiter(RateLimiter):
     """Rate limiter that adapts based on server response and errors."""
     
+    JITTER_MODES = ('full', 'equal', 'none')
+    
     def __init__(self, initial_delay: float = 2.0, min_delay: float = 0.5, 
-                 max_delay: float = 30.0, backoff_factor: float = 2.0):
+                 max_delay: float = 30.0, backoff_factor: float = 2.0,
+                 jitter: str = "full", max_requests_per_minute: Optional[float] = None,
+                 rpm_algorithm: str = "token_bucket"):
         """
         Initialize adaptive rate limiter.
         
@@ -91,34 +469,74 @@ class AdaptiveRateLimiter(RateLimiter):
             min_delay: Minimum delay allowed
             max_delay: Maximum delay allowed
             backoff_factor: Factor to increase delay on errors
+            jitter: Randomization of the backed-off delay: "full" samples it
+                from [min_delay, delay], "equal" from [delay/2, delay],
+                "none" keeps it exact
+            max_requests_per_minute: Maximum requests per minute (optional)
+            rpm_algorithm: Requests-per-minute algorithm, see RateLimiter
         """
-        super().__init__(initial_delay)
+        if jitter not in self.JITTER_MODES:
+            raise ValueError(f"jitter must be one of {', '.join(self.JITTER_MODES)}")
+        super().__init__(initial_delay, max_requests_per_minute, rpm_algorithm)
+        self.jitter = jitter
         self.initial_delay = initial_delay
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.backoff_factor = backoff_factor
         self.error_count = 0
-        self.success_count = 0
+        
+        # Successes are counted lock-free: next() on itertools.count is a
+        # single C call, atomic under the GIL. The consecutive-success count
+        # is the running total minus the base recorded at the last reset.
+        self._success_counter = itertools.count()
+        self._success_total = 0
+        self._success_base = 0
+        
+        # Guards delay adjustments only, so outcomes never queue behind
+        # requests being admitted under the condition
+        self._delay_lock = threading.Lock()
+        # Seqlock over the delay state: writers make it odd for the duration
+        # of an adjustment, so readers can snapshot several fields lock-free
+        self._version = 0
+    
+    @property
+    def success_count(self) -> int:
+        """Consecutive successes since the last delay change or error."""
+        return max(0, self._success_total - self._success_base)
+    
+    def _reset_successes(self):
+        """Restart the consecutive-success count (delay lock must be held)."""
+        self._success_base = next(self._success_counter) + 1
+        self._success_total = self._success_base
         
     def on_success(self):
         """Call this method when a request succeeds."""
-        with self.lock:
-            self.success_count += 1
-            
-            # Gradually reduce delay on consecutive successes
-            if self.success_count >= 5 and self.delay_seconds > self.min_delay:
+        total = next(self._success_counter) + 1
+        self._success_total = total
+        
+        # Reset error count on success
+        if self.error_count > 0:
+            self.error_count = 0
+        
+        # Gradually reduce delay on consecutive successes
+        base = self._success_base
+        if total - base >= 5:
+            with self._delay_lock:
+                if self._success_base != base:
+                    return  # Another thread already closed this window
+                self._version += 1
+                self._success_base = total
+                
                 old_delay = self.delay_seconds
-                self.delay_seconds = max(
-                    self.min_delay, 
-                    self.delay_seconds * 0.9
-                )
+                if old_delay > self.min_delay:
+                    self.delay_seconds = max(
+                        self.min_delay, 
+                        self.delay_seconds * 0.9
+                    )
+                self._version += 1
                 if old_delay != self.delay_seconds:
-                    self.logger.debug(f"Reduced delay to {self.delay_seconds:.2f}s after {self.success_count} successes")
-                self.success_count = 0
-            
-            # Reset error count on success
-            if self.error_count > 0:
-                self.error_count = 0
+                    self.logger.debug("Reduced delay to %.2fs after %d successes",
+                                      self.delay_seconds, total - base)
     
     def on_error(self, error_type: str = "general"):
         """
@@ -127,39 +545,229 @@ class AdaptiveRateLimiter(RateLimiter):
         Args:
             error_type: Type of error (timeout, connection, etc.)
         """
-        with self.lock:
+        with self._delay_lock:
+            self._version += 1
             self.error_count += 1
-            self.success_count = 0
+            self._reset_successes()
             
-            # Increase delay on errors
+            # Increase delay on errors, jittered so workers that fail
+            # together do not retry in lockstep
             old_delay = self.delay_seconds
-            self.delay_seconds = min(
+            new_delay = min(
                 self.max_delay,
                 self.delay_seconds * self.backoff_factor
             )
+            if self.jitter == "full":
+                new_delay = random.uniform(min(self.min_delay, new_delay), new_delay)
+            elif self.jitter == "equal":
+                new_delay = max(self.min_delay, new_delay / 2 + random.uniform(0, new_delay / 2))
+            self.delay_seconds = new_delay
+            self._version += 1
             
             self.logger.warning(
-                f"Error #{self.error_count} ({error_type}): "
-                f"increased delay from {old_delay:.2f}s to {self.delay_seconds:.2f}s"
+                "Error #%d (%s): backed off delay from %.2fs to %.2fs",
+                self.error_count, error_type, old_delay, self.delay_seconds
             )
     
     def reset(self):
         """Reset the rate limiter to initial state."""
-        with self.lock:
+        with self._delay_lock:
+            self._version += 1
             self.delay_seconds = self.initial_delay
             self.error_count = 0
-            self.success_count = 0
+            self._reset_successes()
+            self._version += 1
             self.logger.info("Rate limiter reset to initial state")
     
+    def _delay_snapshot(self) -> Tuple[float, int, int]:
+        """Read delay_seconds, error_count and success_count as one consistent set."""
+        for _ in range(3):
+            version = self._version
+            if not version & 1:
+                snapshot = (self.delay_seconds, self.error_count, self.success_count)
+                if self._version == version:
+                    return snapshot
+        # Sustained write traffic: stop retrying and wait for the writer
+        with self._delay_lock:
+            return self.delay_seconds, self.error_count, self.success_count
+    
     def get_stats(self) -> dict:
         """Get adaptive rate limiter statistics."""
         stats = super().get_stats()
+        delay_seconds, error_count, success_count = self._delay_snapshot()
         stats.update({
-            'error_count': self.error_count,
-            'success_count': self.success_count,
+            'delay_seconds': delay_seconds,
+            'error_count': error_count,
+            'success_count': success_count,
             'initial_delay': self.initial_delay,
             'min_delay': self.min_delay,
             'max_delay': self.max_delay,
-            'backoff_factor': self.backoff_factor
+            'backoff_factor': self.backoff_factor,
+            'jitter': self.jitter
         })
-        return stats 
\ No newline at end of file
+        return stats
+
+
+class ShardedRateLimiter:
+    """
+    Adaptive rate limiter split into independent shards to avoid lock contention.
+    
+    Each thread is pinned to one of K AdaptiveRateLimiter shards, each with
+    its own lock and a K-times longer delay, so the aggregate rate matches
+    the configured one while threads on different shards never contend on
+    the delay. Success and error feedback adapts only the reporting
+    thread's shard. The per-minute cap is not split: a fraction of it per
+    shard could round to less than one request, so it is enforced by one
+    limiter shared by all shards, after the shard's delay.
+    """
+    
+    def __init__(self, shards: int = 4, initial_delay: float = 2.0, min_delay: float = 0.5,
+                 max_delay: float = 30.0, backoff_factor: float = 2.0, jitter: str = "full",
+                 max_requests_per_minute: Optional[float] = None,
+                 rpm_algorithm: str = "token_bucket"):
+        """
+        Initialize sharded rate limiter.
+        
+        Args:
+            shards: Number of independent shards (typically the worker count)
+            initial_delay: Initial aggregate delay between requests
+            min_delay: Minimum aggregate delay allowed
+            max_delay: Maximum aggregate delay allowed
+            backoff_factor: Factor to increase a shard's delay on errors
+            jitter: Backoff jitter mode, see AdaptiveRateLimiter
+            max_requests_per_minute: Aggregate maximum requests per minute (optional)
+            rpm_algorithm: Requests-per-minute algorithm, see RateLimiter
+        """
+        self.shards = [
+            AdaptiveRateLimiter(
+                initial_delay=initial_delay * shards,
+                min_delay=min_delay * shards,
+                max_delay=max_delay * shards,
+                backoff_factor=backoff_factor,
+                jitter=jitter
+            )
+            for _ in range(shards)
+        ]
+        self.quota = RateLimiter(0.0, max_requests_per_minute, rpm_algorithm) \
+            if max_requests_per_minute else None
+        # Round-robin assignment spreads threads evenly, unlike get_ident() % K
+        # (thread idents are aligned addresses)
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+    
+    def _shard(self) -> AdaptiveRateLimiter:
+        """Return the calling thread's shard, assigning one on first use."""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = self.shards[next(self._next_shard) % len(self.shards)]
+        return shard
+    
+    def wait(self, now: Optional[float] = None):
+        """Wait for the calling thread's shard delay, then for the shared quota."""
+        self._shard().wait(now)
+        if self.quota is not None:
+            self.quota.wait()
+    
+    def acquire(self, n: int = 1, now: Optional[float] = None):
+        """Wait once for n permits from the calling thread's shard and the shared quota."""
+        self._shard().acquire(n, now)
+        if self.quota is not None:
+            self.quota.acquire(n)
+    
+    def reserve(self, n: int = 1, now: Optional[float] = None) -> float:
+        """Reserve n permits without sleeping, see RateLimiter."""
+        scheduled = self._shard().reserve(n, now)
+        if self.quota is not None:
+            # The quota slot goes at or after the shard's, when the request is made
+            scheduled = self.quota.reserve(n, scheduled)
+        return scheduled
+    
+    def on_success(self):
+        """Call this method when a request succeeds."""
+        self._shard().on_success()
+    
+    def on_error(self, error_type: str = "general"):
+        """Call this method when a request fails."""
+        self._shard().on_error(error_type)
+    
+    def reset(self):
+        """Reset every shard to its initial state."""
+        for shard in self.shards:
+            shard.reset()
+    
+    def shutdown(self):
+        """Wake every shard's waiters and stop limiting until resume()."""
+        for shard in self.shards:
+            shard.shutdown()
+        if self.quota is not None:
+            self.quota.shutdown()
+    
+    def resume(self):
+        """Re-enable rate limiting on every shard."""
+        for shard in self.shards:
+            shard.resume()
+        if self.quota is not None:
+            self.quota.resume()
+    
+    def get_stats(self) -> dict:
+        """Get aggregate sharded rate limiter statistics."""
+        shard_stats = [shard.get_stats() for shard in self.shards]
+        count = len(shard_stats)
+        quota_stats = self.quota.get_stats() if self.quota is not None else {}
+        return {
+            'shards': count,
+            # A shard's delay spread over all shards gives the effective aggregate delay
+            'delay_seconds': sum(stats['delay_seconds'] for stats in shard_stats) / count / count,
+            'max_requests_per_minute': quota_stats.get('max_requests_per_minute'),
+            'requests_in_last_minute': quota_stats.get('requests_in_last_minute'),
+            'time_since_last_request': min(stats['time_since_last_request'] for stats in shard_stats),
+            'error_count': sum(stats['error_count'] for stats in shard_stats),
+            'success_count': sum(stats['success_count'] for stats in shard_stats),
+            'shard_delays': [stats['delay_seconds'] for stats in shard_stats]
+        }
+
+
+class AsyncRateLimiter:
+    """
+    asyncio front end for a RateLimiter.
+    
+    Each waiter reserves its slot in the wrapped limiter and then awaits
+    asyncio.sleep() once, so coroutines keep running while one waits and
+    wake in reservation order rather than all at once. All state,
+    including AdaptiveRateLimiter's delay adjustments, lives in the
+    wrapped limiter, whose lock is only held for the reservation, so async
+    and threaded callers can share one limiter.
+    """
+    
+    def __init__(self, limiter: RateLimiter):
+        """
+        Initialize async rate limiter.
+        
+        Args:
+            limiter: Limiter holding the rate limiting state; a
+                ShardedRateLimiter would pin every coroutine on the event
+                loop thread to a single shard
+        """
+        self.limiter = limiter
+    
+    async def wait(self):
+        """Wait if necessary to respect rate limits, without blocking the event loop."""
+        await self.acquire(1)
+    
+    async def acquire(self, n: int = 1):
+        """Wait once for n permits, see RateLimiter.acquire."""
+        sleep_time = self.limiter.reserve(n) - time.monotonic()
+        if sleep_time > SLEEP_EPSILON:
+            await asyncio.sleep(sleep_time)
+    
+    def on_success(self):
+        """Call this method when a request succeeds."""
+        self.limiter.on_success()
+    
+    def on_error(self, error_type: str = "general"):
+        """Call this method when a request fails."""
+        self.limiter.on_error(error_type)
+    
+    def get_stats(self) -> dict:
+        """Get the wrapped limiter's statistics."""
+        return self.limiter.get_stats()